@@ -0,0 +1,18 @@
+# Generated by Django 5.2.17 on 2026-08-29 16:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0001_initial'),
+        ('licenses', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['license', 'is_active', '-created_at'], name='app_license_active_created_idx'),
+        ),
+    ]
@@ -36,6 +36,12 @@ class Application(models.Model):
         indexes = [
             models.Index(fields=['license', 'is_active']),
             models.Index(fields=['api_key']),
+            # Covers the list endpoint's filter + ordering so Postgres can
+            # serve it straight from the index without a sort
+            models.Index(
+                fields=['license', 'is_active', '-created_at'],
+                name='app_license_active_created_idx'
+            ),
         ]
         unique_together = [['license', 'name']]
     
@@ -45,12 +51,12 @@ class Application(models.Model):
     def deactivate(self):
         """Deactivate the application."""
         self.is_active = False
-        self.save()
-    
+        self.save(update_fields=['is_active', 'updated_at'])
+
     def activate(self):
         """Activate the application."""
         self.is_active = True
-        self.save()
+        self.save(update_fields=['is_active', 'updated_at'])
 
 
 class ApplicationMetrics(models.Model):
@@ -1,11 +1,12 @@
 from rest_framework import serializers
 from applications.models import Application, ApplicationMetrics
 from licenses.models import License
+from utility.serializers import CachedFieldsMixin
+from django.db import transaction, IntegrityError
 import secrets
-import string
 
 
-class ApplicationSerializer(serializers.ModelSerializer):
+class ApplicationSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for Application model."""
     
     license_info = serializers.SerializerMethodField()
@@ -28,7 +29,7 @@ class ApplicationSerializer(serializers.ModelSerializer):
         }
 
 
-class ApplicationCreateSerializer(serializers.ModelSerializer):
+class ApplicationCreateSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for creating a new application."""
     
     class Meta:
@@ -41,32 +42,33 @@ class ApplicationCreateSerializer(serializers.ModelSerializer):
         license = self.context.get('license')
         if not license:
             raise serializers.ValidationError("License is required to create an application.")
-        
-        # Generate unique API key
-        api_key = self.generate_api_key()
-        
-        # Create application
-        application = Application.objects.create(
-            license=license,
-            api_key=api_key,
-            **validated_data
-        )
-        
-        return application
-    
+
+        # Rely on the unique index on api_key instead of a SELECT probe:
+        # a collision on 190 bits of entropy is practically impossible, so
+        # retry on IntegrityError instead of checking uniqueness up front.
+        for attempt in range(3):
+            api_key = self.generate_api_key()
+            try:
+                with transaction.atomic():
+                    return Application.objects.create(
+                        license=license,
+                        api_key=api_key,
+                        **validated_data
+                    )
+            except IntegrityError as e:
+                # Only an api_key collision is worth retrying: a duplicate
+                # (license, name) would fail identically on every attempt,
+                # so surface it to the view immediately instead of burning
+                # retries while holding the license row lock
+                if 'api_key' not in str(e) or attempt == 2:
+                    raise
+
     def generate_api_key(self):
         """Generate a secure API key."""
-        alphabet = string.ascii_letters + string.digits
-        api_key = ''.join(secrets.choice(alphabet) for _ in range(32))
-        
-        # Ensure uniqueness
-        while Application.objects.filter(api_key=api_key).exists():
-            api_key = ''.join(secrets.choice(alphabet) for _ in range(32))
-        
-        return f"app_{api_key}"
+        return f"app_{secrets.token_urlsafe(24)}"
 
 
-class ApplicationUpdateSerializer(serializers.ModelSerializer):
+class ApplicationUpdateSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for updating an application."""
     
     class Meta:
@@ -86,7 +88,7 @@ class ApplicationUpdateSerializer(serializers.ModelSerializer):
         return value
 
 
-class ApplicationMetricsSerializer(serializers.ModelSerializer):
+class ApplicationMetricsSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for Application Metrics."""
     
     application_name = serializers.CharField(source='application.name', read_only=True)
@@ -1,10 +1,12 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.pagination import CursorPagination
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
-from django.db import transaction
-from django.db.models import Sum, Avg
+from django.db import transaction, IntegrityError
+from django.db.models import Sum, Avg, Count, F, FloatField, Value
+from django.db.models.functions import Coalesce, NullIf
 from applications.models import Application, ApplicationMetrics
 from applications.serializers import (
     ApplicationSerializer, ApplicationCreateSerializer,
@@ -13,12 +15,19 @@ from applications.serializers import (
 )
 from utility.quotas import quota_service
 from utility.hybrid_auth import HybridJWTAuthentication
+from utility.license_cache import get_cached_license, set_cached_license
 from licenses.models import License, LicenseStatus
 from user.models import UserProfileModel
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Boolean query-param values; unknown values leave the filter unapplied
+_BOOL_MAP = {
+    'true': True, '1': True, 'yes': True,
+    'false': False, '0': False, 'no': False,
+}
+
 
 def get_license_from_request(request):
     """
@@ -26,10 +35,15 @@ def get_license_from_request(request):
     If request.user is a User, get or create a default license.
     If request.user is a License, return it directly.
     """
+    cached = getattr(request, '_cached_license', None)
+    if cached is not None:
+        return cached
+
     user_or_license = request.user
     
     # If it's already a License, return it
     if isinstance(user_or_license, License):
+        request._cached_license = user_or_license
         return user_or_license
     
     # If it's a User, get or create a default license
@@ -38,33 +52,52 @@ def get_license_from_request(request):
         # Use username as tenant_id for simplicity
         tenant_id = f"user_{user_or_license.username}"
         
-        try:
-            license = License.objects.get(tenant_id=tenant_id)
-        except License.DoesNotExist:
-            # Create a default license for the user
+        # Shared cache first: license rows change rarely, so most requests
+        # resolve the tenant without touching the database at all
+        license = get_cached_license(tenant_id)
+        if license is None:
             from django.utils import timezone
             from datetime import timedelta
-            
-            license = License.objects.create(
+
+            # Single SELECT + conditional INSERT; also closes the race where two
+            # concurrent requests both hit the DoesNotExist branch and INSERT.
+            license, created = License.objects.get_or_create(
                 tenant_id=tenant_id,
-                tenant_name=user_or_license.username,
-                max_apps=10,  # Default limit
-                max_executions_per_24h=1000,  # Default limit
-                valid_from=timezone.now(),
-                valid_to=timezone.now() + timedelta(days=365),  # 1 year default
-                status=LicenseStatus.ACTIVE,
-                created_by=user_or_license.username,
-                contact_email=user_or_license.email or '',
-                contact_name=user_or_license.get_full_name() or user_or_license.username
+                defaults={
+                    'tenant_name': user_or_license.username,
+                    'max_apps': 10,  # Default limit
+                    'max_executions_per_24h': 1000,  # Default limit
+                    'valid_from': timezone.now(),
+                    'valid_to': timezone.now() + timedelta(days=365),  # 1 year default
+                    'status': LicenseStatus.ACTIVE,
+                    'created_by': user_or_license.username,
+                    'contact_email': user_or_license.email or '',
+                    'contact_name': user_or_license.get_full_name() or user_or_license.username,
+                }
             )
-            logger.info(f"Created default license for user {user_or_license.username}")
+            if created:
+                logger.info(f"Created default license for user {user_or_license.username}")
+            set_cached_license(license)
         
+        request._cached_license = license
         return license
     
     # Fallback: raise error
     raise ValueError(f"Unexpected user type: {type(user_or_license)}")
 
 
+def get_application_or_404(pk, license):
+    """
+    Fetch an application scoped to a license, JOIN-loading the license row so
+    serializers touching license_info don't issue a second query.
+    """
+    return get_object_or_404(
+        Application.objects.select_related('license'),
+        pk=pk,
+        license=license
+    )
+
+
 class ApplicationRegisterAPIView(APIView):
     """
     Public endpoint to register a new application.
@@ -83,15 +116,10 @@ class ApplicationRegisterAPIView(APIView):
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        # Check for duplicate name
-        if Application.objects.filter(
-            license=license,
-            name=serializer.validated_data['name']
-        ).exists():
-            return Response(
-                {'error': 'Application with this name already exists'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        # Serialize concurrent registrations for this tenant on the license
+        # row; duplicate names are caught by the (license, name) unique
+        # constraint instead of a separate SELECT probe.
+        license = License.objects.select_for_update().get(pk=license.pk)
 
         # Atomically check and increment app count (prevents race conditions)
         success, current_count, error_msg = quota_service.check_and_increment_app_count_atomic(
@@ -128,6 +156,15 @@ class ApplicationRegisterAPIView(APIView):
                 status=status.HTTP_201_CREATED
             )
 
+        except IntegrityError:
+            # Duplicate (license, name): roll back the counter increment and
+            # report it like the old pre-check did
+            quota_service.decrement_app_count(license.tenant_id)
+            return Response(
+                {'error': 'Application with this name already exists'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         except Exception as e:
             # Rollback the counter increment if application creation fails
             quota_service.decrement_app_count(license.tenant_id)
@@ -135,25 +172,34 @@ class ApplicationRegisterAPIView(APIView):
             raise
 
 
+class ApplicationCursorPagination(CursorPagination):
+    """Keyset pagination over the indexed (license, is_active, -created_at)."""
+    ordering = '-created_at'
+    page_size = 50
+
+
 class ApplicationListAPIView(APIView):
     """
     List applications for authenticated tenant.
     """
     authentication_classes = [HybridJWTAuthentication]
     permission_classes = [IsAuthenticated]
-    
+    pagination_class = ApplicationCursorPagination
+
     def get(self, request):
         """Get all applications for the authenticated tenant."""
         license = get_license_from_request(request)
-        applications = Application.objects.filter(license=license)
-        
+        applications = Application.objects.select_related('license').filter(license=license)
+
         # Filter by active status
-        is_active = request.query_params.get('is_active')
+        is_active = _BOOL_MAP.get((request.query_params.get('is_active') or '').lower())
         if is_active is not None:
-            applications = applications.filter(is_active=is_active.lower() == 'true')
-        
-        serializer = ApplicationSerializer(applications, many=True)
-        return Response(serializer.data)
+            applications = applications.filter(is_active=is_active)
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(applications, request, view=self)
+        serializer = ApplicationSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
 
 class ApplicationDetailAPIView(APIView):
@@ -164,7 +210,7 @@ class ApplicationDetailAPIView(APIView):
     permission_classes = [IsAuthenticated]
     
     def get_object(self, pk, license):
-        return get_object_or_404(Application, pk=pk, license=license)
+        return get_application_or_404(pk, license)
     
     def get(self, request, pk):
         """Get application details."""
@@ -191,8 +237,14 @@ class ApplicationDetailAPIView(APIView):
     @transaction.atomic
     def delete(self, request, pk):
         """Deactivate an application."""
-        application = self.get_object(pk, request.user)
-        
+        # Only toggling is_active here: skip the wide columns (config JSON,
+        # description) that a full-row fetch would pull in.
+        application = get_object_or_404(
+            Application.objects.only('id', 'is_active', 'license_id'),
+            pk=pk,
+            license=request.user
+        )
+
         if application.is_active:
             application.deactivate()
             # Update cache
@@ -214,8 +266,8 @@ class ApplicationMetricsAPIView(APIView):
         
         if pk:
             # Metrics for specific application
-            application = get_object_or_404(Application, pk=pk, license=license)
-            metrics = ApplicationMetrics.objects.filter(application=application)
+            application = get_application_or_404(pk, license)
+            metrics = ApplicationMetrics.objects.select_related('application').filter(application=application)
             
             # Filter by date range
             start_date = request.query_params.get('start_date')
@@ -230,8 +282,9 @@ class ApplicationMetricsAPIView(APIView):
             return Response(serializer.data)
         
         else:
-            # Aggregate metrics for all applications
-            applications = Application.objects.filter(license=license)
+            # Aggregate metrics for all applications; only id/is_active are
+            # ever needed, so keep the row projection narrow.
+            applications = Application.objects.filter(license=license).only('id', 'is_active')
             
             metrics = ApplicationMetrics.objects.filter(
                 application__in=applications
@@ -239,22 +292,28 @@ class ApplicationMetricsAPIView(APIView):
                 total_jobs=Sum('total_jobs'),
                 successful_jobs=Sum('successful_jobs'),
                 failed_jobs=Sum('failed_jobs'),
-                avg_execution_time=Avg('avg_execution_time')
+                avg_execution_time=Avg('avg_execution_time'),
+                # Success rate computed in SQL from the aliases above (the
+                # aliases shadow the model fields inside this aggregate, so
+                # they must be referenced via F); NullIf avoids division by
+                # zero and Coalesce maps the empty case to 0
+                avg_success_rate=Coalesce(
+                    F('successful_jobs') * 100.0 / NullIf(F('total_jobs'), 0),
+                    Value(0.0),
+                    output_field=FloatField(),
+                ),
             )
             
-            # Add counts
-            metrics['total_applications'] = applications.count()
-            metrics['active_applications'] = applications.filter(is_active=True).count()
-            metrics['inactive_applications'] = applications.filter(is_active=False).count()
-            
-            # Calculate success rate
-            if metrics['total_jobs']:
-                metrics['avg_success_rate'] = (
-                    metrics['successful_jobs'] / metrics['total_jobs'] * 100
-                )
-            else:
-                metrics['avg_success_rate'] = 0
-            
+            # Add counts: one GROUP BY on is_active, answered index-only by
+            # the (license, is_active) index
+            rows = {
+                row['is_active']: row['c']
+                for row in applications.values('is_active').annotate(c=Count('id'))
+            }
+            metrics['active_applications'] = rows.get(True, 0)
+            metrics['inactive_applications'] = rows.get(False, 0)
+            metrics['total_applications'] = sum(rows.values())
+
             return Response(metrics)
 
 
@@ -269,23 +328,28 @@ class ApplicationActivateAPIView(APIView):
     def post(self, request, pk):
         """Activate an application."""
         license = get_license_from_request(request)
-        application = get_object_or_404(Application, pk=pk, license=license)
+        application = get_application_or_404(pk, license)
         
         if not application.is_active:
-            # Check if we can activate another app
-            current_count = license.applications.filter(is_active=True).count()
-            if current_count >= license.max_apps:
+            # Atomically check and increment app count (prevents race conditions,
+            # same path as registration)
+            success, current_count, error_msg = quota_service.check_and_increment_app_count_atomic(
+                license.tenant_id,
+                license.max_apps
+            )
+
+            if not success:
                 return Response(
                     {
                         'error': 'Maximum number of active applications reached',
                         'max_apps': license.max_apps,
-                        'current_count': current_count
+                        'current_count': current_count,
+                        'message': error_msg or f'You have reached the maximum of {license.max_apps} applications'
                     },
                     status=status.HTTP_403_FORBIDDEN
                 )
-            
+
             application.activate()
-            quota_service.increment_app_count(license.tenant_id)
         
         serializer = ApplicationSerializer(application)
         return Response(serializer.data)
@@ -294,7 +358,7 @@ class ApplicationActivateAPIView(APIView):
     def delete(self, request, pk):
         """Deactivate an application."""
         license = get_license_from_request(request)
-        application = get_object_or_404(Application, pk=pk, license=license)
+        application = get_application_or_404(pk, license)
         
         if application.is_active:
             application.deactivate()
@@ -1,29 +1,52 @@
+import hashlib
+import time
 import jwt
-from datetime import datetime, timedelta
 from django.conf import settings
+from django.core.cache import cache
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 from user.models import UserProfileModel
 
+# How long a verified (token -> user) entry stays cached. Kept short so
+# deactivated users are picked up quickly; expiry is still checked locally.
+AUTH_CACHE_TIMEOUT = 60
+
+# Resolved once at import time; LazySettings attribute lookups are not free
+# on the per-request hot path.
+JWT_SECRET_KEY = settings.JWT_SECRET_KEY
+JWT_ALGORITHM = settings.JWT_ALGORITHM
+JWT_ACCESS_TOKEN_LIFETIME = settings.JWT_ACCESS_TOKEN_LIFETIME
+
+
+def token_cache_key(token):
+    """Cache key for a verified token, keyed by a short digest of the token."""
+    return 'auth:jwt:' + hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+
+
+def invalidate_token_cache(token):
+    """Drop the cached authentication result for a token (e.g. on logout)."""
+    cache.delete(token_cache_key(token))
+
 
 def generate_jwt_token(user):
     """Generate JWT token for a user."""
+    now = int(time.time())
     payload = {
         'user_id': user.id,
         'username': user.username,
         'email': user.email,
-        'exp': datetime.utcnow() + timedelta(seconds=settings.JWT_ACCESS_TOKEN_LIFETIME),
-        'iat': datetime.utcnow()
+        'exp': now + JWT_ACCESS_TOKEN_LIFETIME,
+        'iat': now
     }
 
-    token = jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    token = jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
     return token
 
 
 def decode_jwt_token(token):
     """Decode and verify JWT token."""
     try:
-        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
         return payload
     except jwt.ExpiredSignatureError:
         raise AuthenticationFailed('Token has expired')
@@ -47,6 +70,16 @@ class JWTAuthentication(BaseAuthentication):
             if prefix.lower() != 'bearer':
                 raise AuthenticationFailed('Invalid authentication scheme')
 
+            # Fast path: reuse a recently verified token without re-running the
+            # HMAC verify and user SELECT. Expiry is still enforced locally.
+            cache_key = token_cache_key(token)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                exp, user = cached
+                if exp > time.time() and user.is_active:
+                    return (user, token)
+                cache.delete(cache_key)
+
             payload = decode_jwt_token(token)
             user_id = payload.get('user_id')
 
@@ -54,13 +87,18 @@ class JWTAuthentication(BaseAuthentication):
                 raise AuthenticationFailed('Token payload invalid')
 
             try:
-                user = UserProfileModel.objects.get(id=user_id)
+                # Narrow projection: auth only needs identity + is_active,
+                # not the profile text columns
+                user = UserProfileModel.objects.only(
+                    'id', 'username', 'email', 'is_active'
+                ).get(id=user_id)
             except UserProfileModel.DoesNotExist:
                 raise AuthenticationFailed('User not found')
 
             if not user.is_active:
                 raise AuthenticationFailed('User is inactive')
 
+            cache.set(cache_key, (payload['exp'], user), AUTH_CACHE_TIMEOUT)
             return (user, token)
 
         except ValueError:
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
+from django.db.models import Q
 from user.models import UserProfileModel
 
 
@@ -17,22 +18,26 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
             'last_name': {'required': False}
         }
 
-    def validate_email(self, value):
-        """Check that email is unique."""
-        if UserProfileModel.objects.filter(email=value).exists():
-            raise serializers.ValidationError("A user with this email already exists.")
-        return value
-
-    def validate_username(self, value):
-        """Check that username is unique."""
-        if UserProfileModel.objects.filter(username=value).exists():
-            raise serializers.ValidationError("A user with this username already exists.")
-        return value
-
     def validate(self, data):
-        """Check that passwords match."""
+        """Check that passwords match and email/username are unique."""
         if data['password'] != data['password_confirm']:
             raise serializers.ValidationError({"password": "Passwords do not match."})
+
+        # Single SELECT for both uniqueness checks instead of one per field
+        existing = UserProfileModel.objects.filter(
+            Q(email=data['email']) | Q(username=data['username'])
+        ).values('email', 'username')
+
+        errors = {}
+        for row in existing:
+            if row['email'] == data['email']:
+                errors['email'] = "A user with this email already exists."
+            if row['username'] == data['username']:
+                errors['username'] = "A user with this username already exists."
+
+        if errors:
+            raise serializers.ValidationError(errors)
+
         return data
 
     def create(self, validated_data):
@@ -3,7 +3,7 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from .serializers import UserRegistrationSerializer, UserLoginSerializer, UserSerializer
-from .jwt_utils import generate_jwt_token, JWTAuthentication
+from .jwt_utils import generate_jwt_token, invalidate_token_cache, JWTAuthentication
 
 
 @api_view(['POST'])
@@ -62,6 +62,9 @@ def login(request):
 @permission_classes([IsAuthenticated])
 def logout(request):
     """Logout user (client should discard token)."""
+    if request.auth:
+        invalidate_token_cache(request.auth)
+
     return Response({
         'success': True,
         'message': 'Logout successful'
@@ -0,0 +1,14 @@
+import django_filters
+
+from jobs.models import Job
+
+
+class JobFilter(django_filters.FilterSet):
+    """Query-param filters for the job list, matching the legacy names."""
+    application_id = django_filters.UUIDFilter(field_name='application_id')
+    start_date = django_filters.IsoDateTimeFilter(field_name='started_at', lookup_expr='gte')
+    end_date = django_filters.IsoDateTimeFilter(field_name='started_at', lookup_expr='lte')
+
+    class Meta:
+        model = Job
+        fields = ['application_id', 'status', 'start_date', 'end_date']
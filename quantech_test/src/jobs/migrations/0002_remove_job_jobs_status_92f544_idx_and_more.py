@@ -0,0 +1,27 @@
+# Generated by Django 5.2.17 on 2026-08-29 16:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0002_application_app_license_active_created_idx'),
+        ('jobs', '0001_initial'),
+        ('licenses', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='job',
+            name='jobs_status_92f544_idx',
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['license', 'status'], name='jobs_license_dca21f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['license', 'status', 'started_at'], name='jobs_license_64fa19_idx'),
+        ),
+    ]
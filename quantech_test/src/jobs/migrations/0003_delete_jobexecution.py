@@ -0,0 +1,16 @@
+# Generated by Django 5.2.17 on 2026-08-29 16:21
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_remove_job_jobs_status_92f544_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='JobExecution',
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.17 on 2026-08-29 16:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0002_application_app_license_active_created_idx'),
+        ('jobs', '0003_delete_jobexecution'),
+        ('licenses', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='job',
+            constraint=models.CheckConstraint(check=models.Q(('status__in', ['PENDING', 'RUNNING', 'COMPLETED', 'FAILED', 'CANCELLED'])), name='job_status_valid'),
+        ),
+    ]
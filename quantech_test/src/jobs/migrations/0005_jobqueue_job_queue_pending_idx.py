@@ -0,0 +1,17 @@
+# Generated by Django 5.2.17 on 2026-08-29 16:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_job_job_status_valid'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobqueue',
+            index=models.Index(condition=models.Q(('is_processing', False)), fields=['-priority', 'created_at'], name='job_queue_pending_idx'),
+        ),
+    ]
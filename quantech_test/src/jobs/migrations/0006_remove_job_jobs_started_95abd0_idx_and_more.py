@@ -0,0 +1,28 @@
+# Generated by Django 5.2.17 on 2026-08-29 16:25
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0002_application_app_license_active_created_idx'),
+        ('jobs', '0005_jobqueue_job_queue_pending_idx'),
+        ('licenses', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='job',
+            name='jobs_started_95abd0_idx',
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['started_at'], name='jobs_started_at_brin'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'RUNNING')), fields=['license'], name='jobs_running_idx'),
+        ),
+    ]
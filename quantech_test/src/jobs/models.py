@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import models, transaction
+from django.contrib.postgres.indexes import BrinIndex
+from django.utils import timezone
 from applications.models import Application
 from licenses.models import License
 import uuid
@@ -53,13 +55,46 @@ class Job(models.Model):
         indexes = [
             models.Index(fields=['application', 'status']),
             models.Index(fields=['license', 'started_at']),
-            models.Index(fields=['started_at']),
-            models.Index(fields=['status']),
+            # BRIN instead of btree: started_at is append-mostly, so block
+            # ranges stay well correlated and the index is orders of
+            # magnitude smaller
+            BrinIndex(fields=['started_at'], name='jobs_started_at_brin'),
+            # Running jobs are a sliver of the table; a partial index keeps
+            # the hot set resident in cache
+            models.Index(
+                fields=['license'],
+                name='jobs_running_idx',
+                condition=models.Q(status='RUNNING'),
+            ),
+            # Cover the statistics aggregates: per-tenant status counts and
+            # time-window counts resolve with index-only scans. The composite
+            # also serves plain status filters, so no bare status index.
+            models.Index(fields=['license', 'status']),
+            models.Index(fields=['license', 'status', 'started_at']),
+        ]
+        constraints = [
+            # Enforce the JobStatus vocabulary in the database, not just in
+            # Django forms/serializers
+            # check= (not the 5.1+ condition=) to stay importable on the
+            # Django 5.0 pin in requirements.txt
+            models.CheckConstraint(
+                check=models.Q(status__in=JobStatus.values),
+                name='job_status_valid',
+            ),
         ]
     
     def __str__(self):
         return f"{self.name} - {self.status}"
     
+    @property
+    def duration_seconds(self):
+        """Duration in seconds, from execution_time or the timestamp delta."""
+        if self.execution_time:
+            return self.execution_time
+        if self.started_at and self.finished_at:
+            return (self.finished_at - self.started_at).total_seconds()
+        return None
+
     def is_running(self):
         """Check if job is currently running."""
         return self.status == JobStatus.RUNNING
@@ -69,40 +104,47 @@ class Job(models.Model):
         return self.status in [JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED]
     
     def calculate_execution_time(self):
-        """Calculate execution time if job is finished."""
+        """Calculate and set execution time if job is finished.
+
+        Does not save; callers persist the value with their own write so the
+        finish path issues a single UPDATE.
+        """
         if self.finished_at and self.started_at:
             delta = self.finished_at - self.started_at
             self.execution_time = delta.total_seconds()
-            self.save()
             return self.execution_time
         return None
 
 
-class JobExecution(models.Model):
-    """
-    Track job executions for rate limiting (24h sliding window).
-    """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    license = models.ForeignKey(License, on_delete=models.CASCADE, related_name='executions')
-    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='execution_record')
-    
-    # Execution timestamp
-    executed_at = models.DateTimeField(auto_now_add=True)
-    
-    # Quick reference fields for optimization
-    tenant_id = models.CharField(max_length=255, db_index=True)
-    
-    class Meta:
-        db_table = 'job_executions'
-        ordering = ['-executed_at']
-        indexes = [
-            models.Index(fields=['license', 'executed_at']),
-            models.Index(fields=['tenant_id', 'executed_at']),
-            models.Index(fields=['executed_at']),
-        ]
-    
-    def __str__(self):
-        return f"Execution for {self.tenant_id} at {self.executed_at}"
+class JobQueueManager(models.Manager):
+    """Manager with a worker-safe dequeue."""
+
+    def dequeue(self):
+        """
+        Claim the next due entry, or None if the queue is empty.
+
+        SELECT ... FOR UPDATE SKIP LOCKED lets concurrent workers each grab
+        a different row instead of serializing on the head of the queue.
+        """
+        with transaction.atomic():
+            entry = (
+                self.select_for_update(skip_locked=True)
+                .filter(is_processing=False)
+                .filter(
+                    models.Q(scheduled_at__isnull=True) |
+                    models.Q(scheduled_at__lte=timezone.now())
+                )
+                .order_by('-priority', 'created_at')
+                .first()
+            )
+            if entry is None:
+                return None
+
+            entry.is_processing = True
+            entry.attempts += 1
+            entry.last_attempt_at = timezone.now()
+            entry.save(update_fields=['is_processing', 'attempts', 'last_attempt_at'])
+            return entry
 
 
 class JobQueue(models.Model):
@@ -124,13 +166,22 @@ class JobQueue(models.Model):
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     last_attempt_at = models.DateTimeField(null=True, blank=True)
-    
+
+    objects = JobQueueManager()
+
     class Meta:
         db_table = 'job_queue'
         ordering = ['-priority', 'created_at']
         indexes = [
             models.Index(fields=['is_processing', 'priority']),
             models.Index(fields=['scheduled_at']),
+            # Partial index over only the pending entries: the dequeue scan
+            # stays O(log pending) no matter how much history accumulates
+            models.Index(
+                fields=['-priority', 'created_at'],
+                name='job_queue_pending_idx',
+                condition=models.Q(is_processing=False),
+            ),
         ]
     
     def __str__(self):
@@ -1,6 +1,5 @@
 from rest_framework import serializers
-from jobs.models import Job, JobExecution, JobQueue, JobStatus
-from applications.models import Application
+from jobs.models import Job, JobQueue, JobStatus
 from django.utils import timezone
 
 
@@ -9,8 +8,10 @@ class JobSerializer(serializers.ModelSerializer):
     
     application_name = serializers.CharField(source='application.name', read_only=True)
     license_tenant = serializers.CharField(source='license.tenant_id', read_only=True)
-    duration = serializers.SerializerMethodField()
-    
+    # Plain field over the model property: no per-row method dispatch or
+    # string formatting during list serialization; clients format the number
+    duration = serializers.FloatField(source='duration_seconds', read_only=True)
+
     class Meta:
         model = Job
         fields = [
@@ -22,15 +23,6 @@ class JobSerializer(serializers.ModelSerializer):
         read_only_fields = [
             'id', 'started_at', 'finished_at', 'execution_time'
         ]
-    
-    def get_duration(self, obj):
-        """Get human-readable duration."""
-        if obj.execution_time:
-            return f"{obj.execution_time:.2f} seconds"
-        elif obj.started_at and obj.finished_at:
-            delta = obj.finished_at - obj.started_at
-            return f"{delta.total_seconds():.2f} seconds"
-        return None
 
 
 class JobStartSerializer(serializers.Serializer):
@@ -40,17 +32,6 @@ class JobStartSerializer(serializers.Serializer):
     name = serializers.CharField(max_length=255, required=True)
     description = serializers.CharField(required=False, allow_blank=True)
     metadata = serializers.JSONField(required=False, default=dict)
-    
-    def validate_application_id(self, value):
-        """Validate that the application exists and is active."""
-        try:
-            app = Application.objects.get(id=value)
-            if not app.is_active:
-                raise serializers.ValidationError("Application is not active.")
-            self.context['application'] = app
-        except Application.DoesNotExist:
-            raise serializers.ValidationError("Application not found.")
-        return value
 
 
 class JobFinishSerializer(serializers.Serializer):
@@ -65,28 +46,6 @@ class JobFinishSerializer(serializers.Serializer):
     error_message = serializers.CharField(required=False, allow_blank=True)
     cpu_usage = serializers.FloatField(required=False, min_value=0, max_value=100)
     memory_usage = serializers.FloatField(required=False, min_value=0)
-    
-    def validate_job_id(self, value):
-        """Validate that the job exists and is running."""
-        try:
-            job = Job.objects.get(id=value)
-            if job.status != JobStatus.RUNNING:
-                raise serializers.ValidationError(f"Job is not running. Current status: {job.status}")
-            self.context['job'] = job
-        except Job.DoesNotExist:
-            raise serializers.ValidationError("Job not found.")
-        return value
-
-
-class JobExecutionSerializer(serializers.ModelSerializer):
-    """Serializer for JobExecution model."""
-    
-    job_name = serializers.CharField(source='job.name', read_only=True)
-    
-    class Meta:
-        model = JobExecution
-        fields = ['id', 'license', 'job', 'job_name', 'executed_at', 'tenant_id']
-        read_only_fields = ['id', 'executed_at']
 
 
 class JobQueueSerializer(serializers.ModelSerializer):
@@ -0,0 +1,72 @@
+from celery import shared_task
+from django.db.models import F, Case, When, Value
+from django.db.models.functions import Greatest, Least
+from django.utils import timezone
+import logging
+
+from jobs.models import JobStatus
+
+logger = logging.getLogger(__name__)
+
+# Which metrics counter a finished job bumps, keyed by terminal status
+_STATUS_COUNTER = {
+    JobStatus.COMPLETED: 'successful_jobs',
+    JobStatus.FAILED: 'failed_jobs',
+}
+
+
+@shared_task
+def update_application_metrics(job_id):
+    """
+    Update daily application metrics after a job finishes.
+
+    Runs on a worker so the finish endpoint doesn't pay for the
+    get_or_create + UPDATE round-trips inside its transaction.
+    """
+    from jobs.models import Job
+    from applications.models import ApplicationMetrics
+
+    try:
+        job = Job.objects.select_related('application').get(id=job_id)
+    except Job.DoesNotExist:
+        logger.warning(f"Job {job_id} no longer exists, skipping metrics update")
+        return
+
+    today = timezone.now().date()
+    metrics, _ = ApplicationMetrics.objects.get_or_create(
+        application=job.application,
+        date=today,
+        defaults={
+            'total_jobs': 0,
+            'successful_jobs': 0,
+            'failed_jobs': 0,
+            'avg_execution_time': 0,
+            'max_execution_time': 0,
+            'min_execution_time': 0
+        }
+    )
+
+    # Single atomic UPDATE: all counters and min/max/avg are computed
+    # DB-side against the current row, so concurrent finishes cannot
+    # lose updates the way a read-modify-write would
+    update_kwargs = {'total_jobs': F('total_jobs') + 1}
+    counter = _STATUS_COUNTER.get(job.status)
+    if counter:
+        update_kwargs[counter] = F(counter) + 1
+
+    if job.execution_time:
+        execution_time = job.execution_time
+        update_kwargs['max_execution_time'] = Greatest(
+            'max_execution_time', Value(execution_time)
+        )
+        update_kwargs['min_execution_time'] = Case(
+            When(min_execution_time=0, then=Value(execution_time)),
+            default=Least('min_execution_time', Value(execution_time)),
+        )
+        # Running average over the pre-update total_jobs
+        update_kwargs['avg_execution_time'] = (
+            (F('avg_execution_time') * F('total_jobs') + Value(execution_time))
+            / (F('total_jobs') + 1)
+        )
+
+    ApplicationMetrics.objects.filter(pk=metrics.pk).update(**update_kwargs)
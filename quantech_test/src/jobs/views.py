@@ -2,20 +2,31 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.generics import ListAPIView
+from rest_framework.pagination import CursorPagination
+from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
+from django.http import StreamingHttpResponse
 from django.db import transaction
-from django.db.models import Count, Avg
+from django.db.models import (
+    Count, Avg, Q, F, Value, DurationField, ExpressionWrapper
+)
+from django.db.models.functions import Extract
 from django.utils import timezone
 from datetime import timedelta
 import uuid
-from jobs.models import Job, JobExecution, JobStatus
+import orjson
+from jobs.models import Job, JobStatus
 from jobs.serializers import (
     JobSerializer, JobStartSerializer, JobFinishSerializer,
-    JobStatisticsSerializer, ExecutionWindowSerializer
+    JobStatisticsSerializer
 )
-from applications.models import ApplicationMetrics
+from jobs.filters import JobFilter
+from jobs.tasks import update_application_metrics
+from applications.models import Application
 from utility.quotas import quota_service
 from utility.hybrid_auth import HybridJWTAuthentication
+from utility.license_cache import get_cached_license, set_cached_license
 from licenses.models import License, LicenseStatus
 from user.models import UserProfileModel
 import logging
@@ -29,10 +40,15 @@ def get_license_from_request(request):
     If request.user is a User, get or create a default license.
     If request.user is a License, return it directly.
     """
+    cached = getattr(request, '_cached_license', None)
+    if cached is not None:
+        return cached
+
     user_or_license = request.user
     
     # If it's already a License, return it
     if isinstance(user_or_license, License):
+        request._cached_license = user_or_license
         return user_or_license
     
     # If it's a User, get or create a default license
@@ -41,27 +57,34 @@ def get_license_from_request(request):
         # Use username as tenant_id for simplicity
         tenant_id = f"user_{user_or_license.username}"
         
-        try:
-            license = License.objects.get(tenant_id=tenant_id)
-        except License.DoesNotExist:
-            # Create a default license for the user
+        # Shared cache first: license rows change rarely, so most requests
+        # resolve the tenant without touching the database at all
+        license = get_cached_license(tenant_id)
+        if license is None:
             from django.utils import timezone
             from datetime import timedelta
-            
-            license = License.objects.create(
+
+            # Single SELECT + conditional INSERT; also closes the race where two
+            # concurrent requests both hit the DoesNotExist branch and INSERT.
+            license, created = License.objects.get_or_create(
                 tenant_id=tenant_id,
-                tenant_name=user_or_license.username,
-                max_apps=10,  # Default limit
-                max_executions_per_24h=1000,  # Default limit
-                valid_from=timezone.now(),
-                valid_to=timezone.now() + timedelta(days=365),  # 1 year default
-                status=LicenseStatus.ACTIVE,
-                created_by=user_or_license.username,
-                contact_email=user_or_license.email or '',
-                contact_name=user_or_license.get_full_name() or user_or_license.username
+                defaults={
+                    'tenant_name': user_or_license.username,
+                    'max_apps': 10,  # Default limit
+                    'max_executions_per_24h': 1000,  # Default limit
+                    'valid_from': timezone.now(),
+                    'valid_to': timezone.now() + timedelta(days=365),  # 1 year default
+                    'status': LicenseStatus.ACTIVE,
+                    'created_by': user_or_license.username,
+                    'contact_email': user_or_license.email or '',
+                    'contact_name': user_or_license.get_full_name() or user_or_license.username,
+                }
             )
-            logger.info(f"Created default license for user {user_or_license.username}")
+            if created:
+                logger.info(f"Created default license for user {user_or_license.username}")
+            set_cached_license(license)
         
+        request._cached_license = license
         return license
     
     # Fallback: raise error
@@ -86,13 +109,16 @@ class JobStartAPIView(APIView):
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        # Get the application
-        application = serializer.context['application']
-
-        # Verify application belongs to this license
-        if application.license != license:
+        # Fetch the application scoped to this license in one query, instead
+        # of a serializer-side existence SELECT plus ownership checks here
+        try:
+            application = Application.objects.select_related('license').get(
+                id=serializer.validated_data['application_id'],
+                license=license
+            )
+        except Application.DoesNotExist:
             return Response(
-                {'error': 'Application does not belong to this license'},
+                {'error': 'Application not found or does not belong to this license'},
                 status=status.HTTP_403_FORBIDDEN
             )
 
@@ -103,13 +129,14 @@ class JobStartAPIView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        # Create a temporary job ID for atomic check
-        temp_job_id = str(uuid.uuid4())
+        # The quota ZSET needs a member before the row exists, so generate
+        # the job's UUID here and reuse it for the INSERT below
+        job_id = uuid.uuid4()
 
         # Atomically check quota and record execution (prevents race conditions)
         success, current_count, error_msg = quota_service.check_and_record_execution_atomic(
             license.tenant_id,
-            temp_job_id,
+            str(job_id),
             license.max_executions_per_24h
         )
 
@@ -126,7 +153,7 @@ class JobStartAPIView(APIView):
 
         # Create the job with the same ID used in quota check
         job = Job.objects.create(
-            id=temp_job_id,
+            id=job_id,
             application=application,
             license=license,
             name=serializer.validated_data['name'],
@@ -135,13 +162,6 @@ class JobStartAPIView(APIView):
             status=JobStatus.RUNNING
         )
 
-        # Create execution record
-        JobExecution.objects.create(
-            license=license,
-            job=job,
-            tenant_id=license.tenant_id
-        )
-
         # Update application last activity
         application.last_activity = timezone.now()
         application.save(update_fields=['last_activity'])
@@ -174,123 +194,90 @@ class JobFinishAPIView(APIView):
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
-        # Get the job
-        job = serializer.context['job']
-        
-        # Verify job belongs to this license
-        if job.license != license:
-            return Response(
-                {'error': 'Job does not belong to this license'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
-        # Update job status and details
-        job.status = serializer.validated_data['status']
-        job.finished_at = timezone.now()
-        job.result = serializer.validated_data.get('result', {})
-        job.error_message = serializer.validated_data.get('error_message', '')
-        
+        job_id = serializer.validated_data['job_id']
+        now = timezone.now()
+
+        update_kwargs = {
+            'status': serializer.validated_data['status'],
+            'finished_at': now,
+            'result': serializer.validated_data.get('result', {}),
+            'error_message': serializer.validated_data.get('error_message', ''),
+            # Computed DB-side against the row's own started_at
+            'execution_time': Extract(
+                ExpressionWrapper(
+                    Value(now) - F('started_at'),
+                    output_field=DurationField()
+                ),
+                'epoch'
+            ),
+        }
+
         # Set performance metrics if provided
         if 'cpu_usage' in serializer.validated_data:
-            job.cpu_usage = serializer.validated_data['cpu_usage']
+            update_kwargs['cpu_usage'] = serializer.validated_data['cpu_usage']
         if 'memory_usage' in serializer.validated_data:
-            job.memory_usage = serializer.validated_data['memory_usage']
-        
-        # Calculate execution time
-        job.calculate_execution_time()
-        job.save()
-        
-        # Update application metrics
-        self._update_application_metrics(job)
-        
-        # Return the updated job
+            update_kwargs['memory_usage'] = serializer.validated_data['memory_usage']
+
+        # One conditional UPDATE: the status guard makes concurrent finishes
+        # race-free — exactly one request flips RUNNING to a terminal state
+        affected = Job.objects.filter(
+            id=job_id,
+            license=license,
+            status=JobStatus.RUNNING
+        ).update(**update_kwargs)
+
+        if not affected:
+            # Cheap SELECT only on the failure path, to tell "missing"
+            # apart from "already finished"
+            current_status = Job.objects.filter(
+                id=job_id, license=license
+            ).values_list('status', flat=True).first()
+            if current_status is None:
+                return Response(
+                    {'error': 'Job not found'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            return Response(
+                {'error': f'Job is not running. Current status: {current_status}'},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        # Update application metrics asynchronously once the job row is
+        # committed: the endpoint responds without waiting on the metrics
+        # table, and the worker never sees an uncommitted job
+        transaction.on_commit(
+            lambda: update_application_metrics.delay(str(job_id))
+        )
+
+        # Re-fetch the updated row for the response
+        job = Job.objects.select_related('application', 'license').get(id=job_id)
         job_serializer = JobSerializer(job)
         return Response(job_serializer.data)
-    
-    def _update_application_metrics(self, job):
-        """Update application metrics based on job completion."""
-        from django.db.models import F
-
-        today = timezone.now().date()
-        metrics, _ = ApplicationMetrics.objects.get_or_create(
-            application=job.application,
-            date=today,
-            defaults={
-                'total_jobs': 0,
-                'successful_jobs': 0,
-                'failed_jobs': 0,
-                'avg_execution_time': 0,
-                'max_execution_time': 0,
-                'min_execution_time': 0
-            }
-        )
-        
-        # Update counts
-        metrics.total_jobs = F('total_jobs') + 1
-        if job.status == JobStatus.COMPLETED:
-            metrics.successful_jobs = F('successful_jobs') + 1
-        elif job.status == JobStatus.FAILED:
-            metrics.failed_jobs = F('failed_jobs') + 1
-        
-        # Update execution times
-        if job.execution_time:
-            if metrics.max_execution_time < job.execution_time:
-                metrics.max_execution_time = job.execution_time
-            if metrics.min_execution_time == 0 or metrics.min_execution_time > job.execution_time:
-                metrics.min_execution_time = job.execution_time
-            
-            # Recalculate average
-            total_time = metrics.avg_execution_time * (metrics.total_jobs - 1) + job.execution_time
-            metrics.avg_execution_time = total_time / metrics.total_jobs
-        
-        metrics.save()
 
 
-class JobListAPIView(APIView):
+class JobCursorPagination(CursorPagination):
+    """Keyset pagination over the indexed (license, started_at)."""
+    ordering = '-started_at'
+    page_size = 50
+
+
+class JobListAPIView(ListAPIView):
     """
     List jobs for authenticated tenant.
     """
     authentication_classes = [HybridJWTAuthentication]
     permission_classes = [IsAuthenticated]
-    
-    def get(self, request):
+    serializer_class = JobSerializer
+    pagination_class = JobCursorPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = JobFilter
+
+    def get_queryset(self):
         """Get all jobs for the authenticated tenant."""
-        license = get_license_from_request(request)
-        jobs = Job.objects.filter(license=license)
-        
-        # Filter by application
-        app_id = request.query_params.get('application_id')
-        if app_id:
-            jobs = jobs.filter(application_id=app_id)
-        
-        # Filter by status
-        status_filter = request.query_params.get('status')
-        if status_filter:
-            jobs = jobs.filter(status=status_filter)
-        
-        # Filter by date range
-        start_date = request.query_params.get('start_date')
-        if start_date:
-            jobs = jobs.filter(started_at__gte=start_date)
-        
-        end_date = request.query_params.get('end_date')
-        if end_date:
-            jobs = jobs.filter(started_at__lte=end_date)
-        
-        # Order by started_at descending by default
-        jobs = jobs.order_by('-started_at')
-        
-        # Limit results
-        limit = request.query_params.get('limit', 100)
-        try:
-            limit = min(int(limit), 1000)  # Max 1000 results
-        except ValueError:
-            limit = 100
-        
-        jobs = jobs[:limit]
-        
-        serializer = JobSerializer(jobs, many=True)
-        return Response(serializer.data)
+        license = get_license_from_request(self.request)
+        # JOIN-load application/license so the serializer's dotted sources
+        # don't trigger two extra SELECTs per job
+        return Job.objects.select_related('application', 'license').filter(license=license)
 
 
 class JobDetailAPIView(APIView):
@@ -303,7 +290,11 @@ class JobDetailAPIView(APIView):
     def get(self, request, pk):
         """Get job details."""
         license = get_license_from_request(request)
-        job = get_object_or_404(Job, pk=pk, license=license)
+        job = get_object_or_404(
+            Job.objects.select_related('application', 'license'),
+            pk=pk,
+            license=license
+        )
         serializer = JobSerializer(job)
         return Response(serializer.data)
 
@@ -319,45 +310,30 @@ class JobStatisticsAPIView(APIView):
         """Get job statistics."""
         license = get_license_from_request(request)
         jobs = Job.objects.filter(license=license)
-        
-        # Calculate statistics
-        total_jobs = jobs.count()
-        
-        status_counts = jobs.values('status').annotate(count=Count('status'))
-        status_dict = {item['status']: item['count'] for item in status_counts}
-        
-        running_jobs = status_dict.get(JobStatus.RUNNING, 0)
-        completed_jobs = status_dict.get(JobStatus.COMPLETED, 0)
-        failed_jobs = status_dict.get(JobStatus.FAILED, 0)
-        cancelled_jobs = status_dict.get(JobStatus.CANCELLED, 0)
-        
-        # Calculate average execution time
-        avg_execution = jobs.filter(
-            execution_time__isnull=False
-        ).aggregate(avg=Avg('execution_time'))
-        avg_execution_time = avg_execution['avg'] or 0
-        
-        # Calculate success rate
-        finished_jobs = completed_jobs + failed_jobs
-        success_rate = (completed_jobs / finished_jobs * 100) if finished_jobs > 0 else 0
-        
-        # Calculate time-based statistics
+
+        # All counts in one conditional aggregate: a single round-trip and a
+        # single scan instead of seven separate queries
         now = timezone.now()
-        jobs_last_hour = jobs.filter(started_at__gte=now - timedelta(hours=1)).count()
-        jobs_last_24h = jobs.filter(started_at__gte=now - timedelta(hours=24)).count()
-        jobs_last_7d = jobs.filter(started_at__gte=now - timedelta(days=7)).count()
-        
+        stats = jobs.aggregate(
+            total_jobs=Count('id'),
+            running_jobs=Count('id', filter=Q(status=JobStatus.RUNNING)),
+            completed_jobs=Count('id', filter=Q(status=JobStatus.COMPLETED)),
+            failed_jobs=Count('id', filter=Q(status=JobStatus.FAILED)),
+            cancelled_jobs=Count('id', filter=Q(status=JobStatus.CANCELLED)),
+            avg_execution_time=Avg('execution_time'),
+            jobs_last_hour=Count('id', filter=Q(started_at__gte=now - timedelta(hours=1))),
+            jobs_last_24h=Count('id', filter=Q(started_at__gte=now - timedelta(hours=24))),
+            jobs_last_7d=Count('id', filter=Q(started_at__gte=now - timedelta(days=7))),
+        )
+
+        # Calculate success rate
+        finished_jobs = stats['completed_jobs'] + stats['failed_jobs']
+        success_rate = (stats['completed_jobs'] / finished_jobs * 100) if finished_jobs > 0 else 0
+
         statistics = {
-            'total_jobs': total_jobs,
-            'running_jobs': running_jobs,
-            'completed_jobs': completed_jobs,
-            'failed_jobs': failed_jobs,
-            'cancelled_jobs': cancelled_jobs,
-            'avg_execution_time': avg_execution_time,
+            **stats,
+            'avg_execution_time': stats['avg_execution_time'] or 0,
             'success_rate': success_rate,
-            'jobs_last_hour': jobs_last_hour,
-            'jobs_last_24h': jobs_last_24h,
-            'jobs_last_7d': jobs_last_7d
         }
         
         serializer = JobStatisticsSerializer(data=statistics)
@@ -377,28 +353,31 @@ class ExecutionWindowAPIView(APIView):
         """Get execution window details for the tenant."""
         license = get_license_from_request(request)
         window_hours = int(request.query_params.get('hours', 24))
-        
-        # Get execution history from quota service
+
+        # Get execution history from quota service (lazy iterator)
         executions = quota_service.get_execution_history(
             license.tenant_id,
             window_hours
         )
-        
-        # Calculate summary
-        total_count = len(executions)
-        oldest = executions[0]['datetime'] if executions else None
-        newest = executions[-1]['datetime'] if executions else None
-        
-        data = {
-            'tenant_id': license.tenant_id,
-            'window_hours': window_hours,
-            'executions': executions,
-            'total_count': total_count,
-            'oldest_execution': oldest,
-            'newest_execution': newest
-        }
-        
-        serializer = ExecutionWindowSerializer(data=data)
-        serializer.is_valid(raise_exception=True)
-        
-        return Response(serializer.data)
\ No newline at end of file
+
+        def render():
+            # Emit the JSON body chunk by chunk: memory stays O(entry)
+            # regardless of how many executions the window holds. The
+            # summary fields are accumulated while streaming the list.
+            yield b'{"tenant_id":%s,"window_hours":%d,"executions":[' % (
+                orjson.dumps(license.tenant_id), window_hours
+            )
+            total_count = 0
+            oldest = newest = None
+            for entry in executions:
+                if oldest is None:
+                    oldest = entry['datetime']
+                newest = entry['datetime']
+                chunk = orjson.dumps(entry)
+                yield b',' + chunk if total_count else chunk
+                total_count += 1
+            yield b'],"total_count":%d,"oldest_execution":%s,"newest_execution":%s}' % (
+                total_count, orjson.dumps(oldest), orjson.dumps(newest)
+            )
+
+        return StreamingHttpResponse(render(), content_type='application/json')
\ No newline at end of file
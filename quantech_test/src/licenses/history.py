@@ -0,0 +1,22 @@
+from django.db import transaction
+
+from licenses.models import LicenseHistory
+
+
+def queue_history(request, entry):
+    """
+    Buffer a LicenseHistory row on the request and flush the whole batch
+    with one bulk_create after commit.
+
+    Mutations that log several entries (or bulk admin scripts hitting the
+    endpoints in a loop) pay for a single multi-row INSERT instead of one
+    statement per entry, and the audit write no longer sits inside the
+    request transaction.
+    """
+    pending = getattr(request, '_pending_history', None)
+    if pending is None:
+        pending = request._pending_history = []
+        transaction.on_commit(
+            lambda: LicenseHistory.objects.bulk_create(pending, batch_size=500)
+        )
+    pending.append(entry)
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from licenses.models import LicenseToken
+
+
+class Command(BaseCommand):
+    """
+    Deactivate license tokens whose expiry has passed.
+
+    Keeps the partial is_active index small so token-validity scans on
+    authentication stay cheap. Intended to run nightly (cron/Celery beat).
+    """
+    help = 'Mark expired license tokens as inactive'
+
+    def handle(self, *args, **options):
+        # Single set-based UPDATE; no rows are loaded into memory
+        pruned = LicenseToken.objects.filter(
+            is_active=True,
+            expires_at__lt=timezone.now()
+        ).update(is_active=False)
+        self.stdout.write(f'Deactivated {pruned} expired token(s)')
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.17 on 2026-08-29 16:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licenses', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='license',
+            index=models.Index(condition=models.Q(('status', 'ACTIVE')), fields=['valid_from', 'valid_to'], name='lic_active_valid_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.17 on 2026-08-29 16:28
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def backfill_token_hash(apps, schema_editor):
+    """Hash tokens issued before the column existed; save() only covers new rows."""
+    LicenseToken = apps.get_model('licenses', 'LicenseToken')
+    batch = []
+    for token_obj in LicenseToken.objects.filter(token_hash='').only('id', 'token').iterator(chunk_size=1000):
+        token_obj.token_hash = hashlib.sha256(token_obj.token.encode()).hexdigest()
+        batch.append(token_obj)
+        if len(batch) >= 1000:
+            LicenseToken.objects.bulk_update(batch, ['token_hash'])
+            batch = []
+    if batch:
+        LicenseToken.objects.bulk_update(batch, ['token_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licenses', '0002_license_lic_active_valid_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='licensetoken',
+            name='token_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64),
+        ),
+        migrations.RunPython(backfill_token_hash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.17 on 2026-08-29 16:31
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licenses', '0003_licensetoken_token_hash'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='license',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['features'], name='lic_features_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='licensehistory',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['details'], name='lic_history_details_gin'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.17 on 2026-08-29 16:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licenses', '0004_license_lic_features_gin_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='licensetoken',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['is_active', 'expires_at'], name='ltok_active_exp_idx'),
+        ),
+    ]
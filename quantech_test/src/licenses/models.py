@@ -1,6 +1,8 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
 from django.utils import timezone
 from django.core.validators import MinValueValidator
+import hashlib
 import uuid
 import json
 
@@ -53,6 +55,16 @@ class License(models.Model):
         indexes = [
             models.Index(fields=['tenant_id', 'status']),
             models.Index(fields=['valid_from', 'valid_to']),
+            # Matches the valid_only filter predicate; restricted to ACTIVE
+            # rows since that is the only status the query ever asks for
+            models.Index(
+                fields=['valid_from', 'valid_to'],
+                name='lic_active_valid_idx',
+                condition=models.Q(status='ACTIVE'),
+            ),
+            # Containment/key lookups into the feature flags without
+            # sequential JSON scans
+            GinIndex(fields=['features'], name='lic_features_gin'),
         ]
     
     def __str__(self):
@@ -66,42 +78,47 @@ class License(models.Model):
         """
         return True
 
-    def is_valid(self):
+    def is_valid(self, now=None):
         """Check if license is currently valid."""
-        now = timezone.now()
+        if now is None:
+            now = timezone.now()
         return (
             self.status == LicenseStatus.ACTIVE and
             self.valid_from <= now <= self.valid_to
         )
-    
-    def is_expired(self):
+
+    def is_expired(self, now=None):
         """Check if license has expired."""
-        return timezone.now() > self.valid_to
-    
-    def get_remaining_days(self):
+        if now is None:
+            now = timezone.now()
+        return now > self.valid_to
+
+    def get_remaining_days(self, now=None):
         """Get remaining days until expiration."""
-        if self.is_expired():
+        if now is None:
+            now = timezone.now()
+        if self.is_expired(now):
             return 0
-        delta = self.valid_to - timezone.now()
+        delta = self.valid_to - now
         return delta.days
     
     def suspend(self):
         """Suspend the license."""
         self.status = LicenseStatus.SUSPENDED
-        self.save()
-    
+        self.save(update_fields=['status', 'updated_at'])
+
     def reactivate(self):
         """Reactivate the license if not expired."""
         if not self.is_expired():
             self.status = LicenseStatus.ACTIVE
-            self.save()
+            self.save(update_fields=['status', 'updated_at'])
             return True
         return False
-    
+
     def revoke(self):
         """Permanently revoke the license."""
         self.status = LicenseStatus.REVOKED
-        self.save()
+        self.save(update_fields=['status', 'updated_at'])
 
 
 class LicenseToken(models.Model):
@@ -111,6 +128,9 @@ class LicenseToken(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     license = models.ForeignKey(License, on_delete=models.CASCADE, related_name='tokens')
     token = models.TextField()
+    # sha256 of the token; the indexed column authentication looks up,
+    # instead of comparing full JWT strings
+    token_hash = models.CharField(max_length=64, db_index=True, blank=True, editable=False)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField()
@@ -122,11 +142,28 @@ class LicenseToken(models.Model):
         indexes = [
             models.Index(fields=['license', 'is_active']),
             models.Index(fields=['expires_at']),
+            # Auth only ever scans live tokens; the prune_expired_tokens
+            # command keeps this partial index small
+            models.Index(
+                fields=['is_active', 'expires_at'],
+                name='ltok_active_exp_idx',
+                condition=models.Q(is_active=True),
+            ),
         ]
     
     def __str__(self):
         return f"Token for {self.license.tenant_id}"
-    
+
+    @staticmethod
+    def hash_token(token):
+        """Digest used for indexed token lookups."""
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def save(self, *args, **kwargs):
+        if self.token and not self.token_hash:
+            self.token_hash = self.hash_token(self.token)
+        super().save(*args, **kwargs)
+
     def is_valid(self):
         """Check if token is still valid."""
         return self.is_active and timezone.now() < self.expires_at
@@ -148,6 +185,8 @@ class LicenseHistory(models.Model):
         ordering = ['-performed_at']
         indexes = [
             models.Index(fields=['license', 'performed_at']),
+            # Audit diffs are queried by key when investigating changes
+            GinIndex(fields=['details'], name='lic_history_details_gin'),
         ]
     
     def __str__(self):
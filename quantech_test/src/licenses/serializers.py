@@ -1,10 +1,47 @@
 from rest_framework import serializers
 from licenses.models import License, LicenseToken, LicenseHistory, LicenseUpgrade
+from licenses.history import queue_history
+from utility.license_cache import invalidate_license_cache
+from django.db import transaction
 from django.utils import timezone
+from functools import lru_cache
 import jwt
 from django.conf import settings
 from datetime import timedelta
 
+# Bound once at import: avoids LazySettings __getattr__ on every token
+_JWT_KEY = settings.JWT_SECRET_KEY
+_JWT_ALG = settings.JWT_ALGORITHM
+_JWT_TTL = settings.JWT_ACCESS_TOKEN_LIFETIME
+
+@lru_cache(maxsize=4096)
+def _iso(dt):
+    """Memoized datetime.isoformat(); validity bounds repeat across tokens."""
+    return dt.isoformat()
+
+
+_JWT_PAYLOAD_KEYS = (
+    'tenant_id', 'tenant_name', 'license_id', 'max_apps',
+    'max_executions_per_24h', 'valid_from', 'valid_to', 'status',
+    'iat', 'exp'
+)
+
+
+def build_jwt_payload(license, now, expires_at):
+    """Assemble the standard license-token claims in one place."""
+    return dict(zip(_JWT_PAYLOAD_KEYS, (
+        license.tenant_id,
+        license.tenant_name,
+        str(license.id),
+        license.max_apps,
+        license.max_executions_per_24h,
+        _iso(license.valid_from),
+        _iso(license.valid_to),
+        license.status,
+        now,
+        expires_at,
+    )))
+
 
 class LicenseSerializer(serializers.ModelSerializer):
     """Serializer for License model."""
@@ -23,11 +60,18 @@ class LicenseSerializer(serializers.ModelSerializer):
     
     def get_remaining_days(self, obj):
         """Get remaining days until expiration."""
-        return obj.get_remaining_days()
-    
+        # Annotated list rows already carry the DB-computed interval
+        remaining = getattr(obj, '_remaining', None)
+        if remaining is not None:
+            return max(0, remaining.days)
+        return obj.get_remaining_days(self.context.get('now'))
+
     def get_is_valid(self, obj):
         """Check if license is currently valid."""
-        return obj.is_valid()
+        is_valid = getattr(obj, '_is_valid', None)
+        if is_valid is not None:
+            return is_valid
+        return obj.is_valid(self.context.get('now'))
     
     def validate_valid_to(self, value):
         """Ensure valid_to is in the future."""
@@ -68,35 +112,27 @@ class LicenseCreateSerializer(serializers.ModelSerializer):
         if generate_token:
             token = self.generate_jwt_token(license)
             self.context['token'] = token
-            
-            # Store token in database
-            LicenseToken.objects.create(
+
+            # Build the token row in memory and persist it once the license
+            # INSERT has committed, keeping one round-trip out of the
+            # creation transaction
+            token_obj = LicenseToken(
                 license=license,
                 token=token,
-                expires_at=timezone.now() + timedelta(seconds=settings.JWT_ACCESS_TOKEN_LIFETIME)
+                token_hash=LicenseToken.hash_token(token),
+                expires_at=timezone.now() + timedelta(seconds=_JWT_TTL)
             )
-        
+            transaction.on_commit(
+                lambda: LicenseToken.objects.bulk_create([token_obj])
+            )
+
         return license
     
     def generate_jwt_token(self, license):
         """Generate a JWT token for the license."""
-        from datetime import timedelta
-
         now = timezone.now()
-        payload = {
-            'tenant_id': license.tenant_id,
-            'tenant_name': license.tenant_name,
-            'license_id': str(license.id),
-            'max_apps': license.max_apps,
-            'max_executions_per_24h': license.max_executions_per_24h,
-            'valid_from': license.valid_from.isoformat(),
-            'valid_to': license.valid_to.isoformat(),
-            'status': license.status,
-            'iat': now,
-            'exp': now + timedelta(seconds=settings.JWT_ACCESS_TOKEN_LIFETIME)
-        }
-
-        return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+        payload = build_jwt_payload(license, now, now + timedelta(seconds=_JWT_TTL))
+        return jwt.encode(payload, _JWT_KEY, algorithm=_JWT_ALG)
     
     def to_representation(self, instance):
         """Add token to the response if generated."""
@@ -118,8 +154,9 @@ class LicenseUpdateSerializer(serializers.ModelSerializer):
     
     def update(self, instance, validated_data):
         """Update license and track changes in history."""
-        # Track changes
+        # Single pass: diff and collect the fields that actually changed
         changes = {}
+        changed_fields = {}
         for field, value in validated_data.items():
             old_value = getattr(instance, field)
             if old_value != value:
@@ -127,21 +164,31 @@ class LicenseUpdateSerializer(serializers.ModelSerializer):
                     'old': str(old_value),
                     'new': str(value)
                 }
-        
-        # Update instance
-        for field, value in validated_data.items():
-            setattr(instance, field, value)
-        instance.save()
-        
-        # Create history record
-        if changes:
-            LicenseHistory.objects.create(
-                license=instance,
-                action='UPDATE',
-                details=changes,
-                performed_by=self.context['request'].META.get('REMOTE_ADDR', 'system')
-            )
-        
+                changed_fields[field] = value
+                setattr(instance, field, value)
+
+        if not changes:
+            return instance
+
+        # One UPDATE touching only the changed columns. Queryset update()
+        # bypasses auto_now, so updated_at is set explicitly.
+        changed_fields['updated_at'] = timezone.now()
+        License.objects.filter(pk=instance.pk).update(**changed_fields)
+        instance.updated_at = changed_fields['updated_at']
+
+        # Queryset update() skips post_save, so the tenant cache the auth
+        # backends read must be dropped by hand or stale limits keep being
+        # enforced until the entry times out
+        invalidate_license_cache(instance.tenant_id)
+
+        request = self.context['request']
+        queue_history(request, LicenseHistory(
+            license=instance,
+            action='UPDATE',
+            details=changes,
+            performed_by=request.META.get('REMOTE_ADDR', 'system')
+        ))
+
         return instance
 
 
@@ -186,9 +233,14 @@ class TokenGenerateSerializer(serializers.Serializer):
     expires_in_hours = serializers.IntegerField(default=24, min_value=1, max_value=8760)  # Max 1 year
     
     def validate_tenant_id(self, value):
-        """Check if the tenant exists."""
+        """Check if the tenant exists, keeping the row for the view."""
         try:
-            License.objects.get(tenant_id=value)
+            # The view reads this back from context instead of re-querying;
+            # only the columns the token payload needs are fetched
+            self.context['license'] = License.objects.only(
+                'id', 'tenant_id', 'tenant_name', 'max_apps',
+                'max_executions_per_24h', 'valid_from', 'valid_to', 'status'
+            ).get(tenant_id=value)
         except License.DoesNotExist:
             raise serializers.ValidationError("License with this tenant ID does not exist.")
         return value
@@ -1,57 +1,154 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import status
+from rest_framework import generics, status
+from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.shortcuts import get_object_or_404
 from django.db import transaction
+from django.db.models import (
+    Case, When, Value, BooleanField, F, ExpressionWrapper, DurationField
+)
+from django.db.models.functions import Now
 from django.utils import timezone
 from licenses.models import License, LicenseToken, LicenseHistory, LicenseUpgrade
 from licenses.serializers import (
     LicenseSerializer, LicenseCreateSerializer, LicenseUpdateSerializer,
     LicenseTokenSerializer, LicenseHistorySerializer, LicenseUpgradeSerializer,
-    TokenGenerateSerializer, QuotaStatusSerializer
+    TokenGenerateSerializer, QuotaStatusSerializer, build_jwt_payload
 )
+from licenses.history import queue_history
 from utility.quotas import quota_service
 from utility.hybrid_auth import HybridJWTAuthentication
+from datetime import datetime, timedelta
+import jwt
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Bound once at import: avoids LazySettings __getattr__ on every token
+from django.conf import settings
+_JWT_KEY = settings.JWT_SECRET_KEY
+_JWT_ALG = settings.JWT_ALGORITHM
+
+
+def get_license_for_update(pk):
+    """
+    Fetch a license row locked for the current transaction.
 
-class LicenseListCreateAPIView(APIView):
+    Mutating endpoints go through here so concurrent suspends/upgrades
+    serialize on the row instead of racing; the projection skips created_by
+    and anything else the mutation paths and response serializers never read.
+    """
+    return get_object_or_404(
+        License.objects.select_for_update().only(
+            'id', 'tenant_id', 'tenant_name', 'max_apps',
+            'max_executions_per_24h', 'valid_from', 'valid_to', 'status',
+            'features', 'contact_email', 'contact_name',
+            'created_at', 'updated_at'
+        ),
+        pk=pk
+    )
+
+
+def _license_payload(license):
+    """
+    Trimmed echo body for mutating endpoints.
+
+    Built straight from attributes the handler already holds, skipping the
+    full serializer pass and its per-instance validity recomputation. GET
+    endpoints keep the complete LicenseSerializer representation.
+    """
+    return {
+        'id': str(license.id),
+        'tenant_id': license.tenant_id,
+        'tenant_name': license.tenant_name,
+        'max_apps': license.max_apps,
+        'max_executions_per_24h': license.max_executions_per_24h,
+        'valid_from': license.valid_from,
+        'valid_to': license.valid_to,
+        'status': license.status,
+        'updated_at': license.updated_at,
+    }
+
+
+class LicensePagination(LimitOffsetPagination):
+    """
+    Limit/offset pages with a bounded default.
+
+    Without default_limit (and with no global PAGE_SIZE), DRF skips
+    pagination entirely when the client omits ?limit=, serializing the
+    whole table — exactly what pagination is here to prevent.
+    """
+    default_limit = 50
+
+
+class LicenseListCreateAPIView(generics.ListCreateAPIView):
     """
     List all licenses or create a new one.
     """
     authentication_classes = [HybridJWTAuthentication]
     permission_classes = [IsAuthenticated]
-    
-    def get(self, request):
+    serializer_class = LicenseSerializer
+    pagination_class = LicensePagination
+
+    def get_queryset(self):
         """List all licenses with filtering."""
-        licenses = License.objects.all()
-        
+        self._now = timezone.now()
+
+        # Only the columns the serializer emits; skips created_by and any
+        # future wide fields. The paginator slices with LIMIT/OFFSET so a
+        # page is all that ever gets fetched and serialized.
+        licenses = License.objects.only(
+            'id', 'tenant_id', 'tenant_name', 'max_apps',
+            'max_executions_per_24h', 'valid_from', 'valid_to', 'status',
+            'features', 'contact_email', 'contact_name',
+            'created_at', 'updated_at'
+        ).annotate(
+            # Validity computed in the same SQL pass; the serializer just
+            # reads the attributes instead of running Python per row
+            _is_valid=Case(
+                When(
+                    status='ACTIVE',
+                    valid_from__lte=Now(),
+                    valid_to__gte=Now(),
+                    then=Value(True)
+                ),
+                default=Value(False),
+                output_field=BooleanField(),
+            ),
+            _remaining=ExpressionWrapper(
+                F('valid_to') - Now(),
+                output_field=DurationField(),
+            ),
+        )
+
         # Filter by status
-        status_filter = request.query_params.get('status')
+        status_filter = self.request.query_params.get('status')
         if status_filter:
             licenses = licenses.filter(status=status_filter)
-        
+
         # Filter by tenant_id
-        tenant_filter = request.query_params.get('tenant_id')
+        tenant_filter = self.request.query_params.get('tenant_id')
         if tenant_filter:
             licenses = licenses.filter(tenant_id__icontains=tenant_filter)
-        
+
         # Filter by validity
-        valid_only = request.query_params.get('valid_only')
+        valid_only = self.request.query_params.get('valid_only')
         if valid_only == 'true':
-            now = timezone.now()
             licenses = licenses.filter(
                 status='ACTIVE',
-                valid_from__lte=now,
-                valid_to__gte=now
+                valid_from__lte=self._now,
+                valid_to__gte=self._now
             )
-        
-        serializer = LicenseSerializer(licenses, many=True)
-        return Response(serializer.data)
-    
+
+        return licenses
+
+    def get_serializer_context(self):
+        # One timezone.now() for the whole page instead of two per row
+        context = super().get_serializer_context()
+        context['now'] = getattr(self, '_now', None) or timezone.now()
+        return context
+
     @transaction.atomic
     def post(self, request):
         """Create a new license."""
@@ -60,16 +157,19 @@ class LicenseListCreateAPIView(APIView):
         if serializer.is_valid():
             license = serializer.save()
             
-            # Initialize app count in cache
-            quota_service.update_app_count(license.tenant_id, 0)
+            # Initialize app count in cache once the INSERT has committed;
+            # the Redis round-trip stays off the request transaction
+            transaction.on_commit(
+                lambda tid=license.tenant_id: quota_service.update_app_count(tid, 0)
+            )
             
             # Log the creation
-            LicenseHistory.objects.create(
+            queue_history(request, LicenseHistory(
                 license=license,
                 action='CREATE',
                 details={'initial_data': request.data},
                 performed_by=request.META.get('REMOTE_ADDR', 'system')
-            )
+            ))
             
             return Response(
                 serializer.data,
@@ -98,7 +198,7 @@ class LicenseDetailAPIView(APIView):
     @transaction.atomic
     def put(self, request, pk):
         """Update a license."""
-        license = self.get_object(pk)
+        license = get_license_for_update(pk)
         serializer = LicenseUpdateSerializer(
             license,
             data=request.data,
@@ -107,26 +207,29 @@ class LicenseDetailAPIView(APIView):
         
         if serializer.is_valid():
             serializer.save()
-            return Response(serializer.data)
-        
+            return Response(_license_payload(license))
+
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-    
+
     @transaction.atomic
     def delete(self, request, pk):
         """Revoke a license."""
-        license = self.get_object(pk)
+        license = get_license_for_update(pk)
         license.revoke()
         
         # Log the revocation
-        LicenseHistory.objects.create(
+        queue_history(request, LicenseHistory(
             license=license,
             action='REVOKE',
             details={'reason': request.data.get('reason', 'No reason provided')},
             performed_by=request.META.get('REMOTE_ADDR', 'system')
-        )
+        ))
         
-        # Clear cached data
-        quota_service.reset_tenant_data(license.tenant_id)
+        # Clear cached data after commit — if the revoke rolls back, the
+        # tenant's quota state is left untouched
+        transaction.on_commit(
+            lambda tid=license.tenant_id: quota_service.reset_tenant_data(tid)
+        )
         
         return Response(status=status.HTTP_204_NO_CONTENT)
 
@@ -141,37 +244,35 @@ class LicenseSuspendAPIView(APIView):
     @transaction.atomic
     def post(self, request, pk):
         """Suspend a license."""
-        license = get_object_or_404(License, pk=pk)
+        license = get_license_for_update(pk)
         license.suspend()
         
         # Log the suspension
-        LicenseHistory.objects.create(
+        queue_history(request, LicenseHistory(
             license=license,
             action='SUSPEND',
             details={'reason': request.data.get('reason', 'No reason provided')},
             performed_by=request.META.get('REMOTE_ADDR', 'system')
-        )
+        ))
         
-        serializer = LicenseSerializer(license)
-        return Response(serializer.data)
-    
+        return Response(_license_payload(license))
+
     @transaction.atomic
     def delete(self, request, pk):
         """Reactivate a license."""
-        license = get_object_or_404(License, pk=pk)
-        
+        license = get_license_for_update(pk)
+
         if license.reactivate():
             # Log the reactivation
-            LicenseHistory.objects.create(
+            queue_history(request, LicenseHistory(
                 license=license,
                 action='REACTIVATE',
                 details={'reason': request.data.get('reason', 'No reason provided')},
                 performed_by=request.META.get('REMOTE_ADDR', 'system')
-            )
+            ))
             
-            serializer = LicenseSerializer(license)
-            return Response(serializer.data)
-        
+            return Response(_license_payload(license))
+
         return Response(
             {'error': 'Cannot reactivate expired license'},
             status=status.HTTP_400_BAD_REQUEST
@@ -188,8 +289,8 @@ class LicenseUpgradeAPIView(APIView):
     @transaction.atomic
     def post(self, request, pk):
         """Upgrade/downgrade a license."""
-        license = get_object_or_404(License, pk=pk)
-        
+        license = get_license_for_update(pk)
+
         # Store previous values
         previous_max_apps = license.max_apps
         previous_max_executions = license.max_executions_per_24h
@@ -203,8 +304,8 @@ class LicenseUpgradeAPIView(APIView):
         license.max_apps = new_max_apps
         license.max_executions_per_24h = new_max_executions
         if isinstance(new_valid_to, str):
-            from dateutil import parser
-            new_valid_to = parser.parse(new_valid_to)
+            # ISO-8601 input; stdlib C parser instead of dateutil's tokenizer
+            new_valid_to = datetime.fromisoformat(new_valid_to.replace('Z', '+00:00'))
         license.valid_to = new_valid_to
         license.save()
         
@@ -222,7 +323,7 @@ class LicenseUpgradeAPIView(APIView):
         )
         
         # Log the upgrade
-        LicenseHistory.objects.create(
+        queue_history(request, LicenseHistory(
             license=license,
             action='UPGRADE',
             details={
@@ -234,10 +335,9 @@ class LicenseUpgradeAPIView(APIView):
                 }
             },
             performed_by=request.META.get('REMOTE_ADDR', 'system')
-        )
+        ))
         
-        serializer = LicenseSerializer(license)
-        return Response(serializer.data)
+        return Response(_license_payload(license))
 
 
 class LicenseHistoryAPIView(APIView):
@@ -269,9 +369,10 @@ class TokenGenerateAPIView(APIView):
         if serializer.is_valid():
             tenant_id = serializer.validated_data['tenant_id']
             expires_in_hours = serializer.validated_data['expires_in_hours']
-            
-            license = License.objects.get(tenant_id=tenant_id)
-            
+
+            # Fetched during validation; no second SELECT
+            license = serializer.context['license']
+
             # Check if license is valid
             if not license.is_valid():
                 return Response(
@@ -280,34 +381,23 @@ class TokenGenerateAPIView(APIView):
                 )
             
             # Generate token
-            from datetime import timedelta
-            import jwt
-            from django.conf import settings
-            
-            expires_at = timezone.now() + timedelta(hours=expires_in_hours)
-            
-            payload = {
-                'tenant_id': license.tenant_id,
-                'tenant_name': license.tenant_name,
-                'license_id': str(license.id),
-                'max_apps': license.max_apps,
-                'max_executions_per_24h': license.max_executions_per_24h,
-                'valid_from': license.valid_from.isoformat(),
-                'valid_to': license.valid_to.isoformat(),
-                'status': license.status,
-                'iat': timezone.now(),
-                'exp': expires_at
-            }
-            
-            token = jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+            now = timezone.now()
+            expires_at = now + timedelta(hours=expires_in_hours)
+            payload = build_jwt_payload(license, now, expires_at)
+            token = jwt.encode(payload, _JWT_KEY, algorithm=_JWT_ALG)
             
-            # Store token
-            token_obj = LicenseToken.objects.create(
+            # Store the token after commit; the response only needs the
+            # in-memory value
+            token_obj = LicenseToken(
                 license=license,
                 token=token,
+                token_hash=LicenseToken.hash_token(token),
                 expires_at=expires_at
             )
-            
+            transaction.on_commit(
+                lambda: LicenseToken.objects.bulk_create([token_obj])
+            )
+
             return Response({
                 'token': token,
                 'expires_at': expires_at,
@@ -326,35 +416,21 @@ class QuotaStatusAPIView(APIView):
     
     def get(self, request):
         """Get current quota status."""
-        from licenses.models import License
-        from user.models import UserProfileModel
-        
-        # Get license from request.user (can be User or License)
-        if isinstance(request.user, License):
-            license = request.user
-        elif isinstance(request.user, UserProfileModel):
-            # Get or create default license for user
-            tenant_id = f"user_{request.user.username}"
-            try:
-                license = License.objects.get(tenant_id=tenant_id)
-            except License.DoesNotExist:
-                return Response(
-                    {'error': 'No license found for user'},
-                    status=status.HTTP_404_NOT_FOUND
-                )
-        else:
+        # The auth backend already resolved the license (cached) for both
+        # token types; no isinstance dispatch or extra lookup here
+        license = getattr(request, 'license', None)
+        if license is None:
             return Response(
-                {'error': 'Invalid authentication'},
-                status=status.HTTP_401_UNAUTHORIZED
+                {'error': 'No license found for user'},
+                status=status.HTTP_404_NOT_FOUND
             )
-        
+
         status_data = quota_service.get_quota_status(
             license.tenant_id,
             license.max_executions_per_24h,
             license.max_apps
         )
-        
-        serializer = QuotaStatusSerializer(data=status_data)
-        serializer.is_valid(raise_exception=True)
-        
-        return Response(serializer.data)
\ No newline at end of file
+
+        # Internally synthesized data: no point running it back through
+        # serializer validation
+        return Response(status_data)
\ No newline at end of file
@@ -3,11 +3,35 @@ from rest_framework import exceptions
 from django.utils import timezone
 from django.conf import settings
 from licenses.models import License, LicenseToken
+from utility.license_cache import get_cached_license, set_cached_license
+from utility.hybrid_auth import LICENSE_AUTH_FIELDS
+from utility.token_usage import record_token_usage
+from functools import lru_cache
 import jwt
+import time
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Bound once at import: a reusable PyJWT instance and the resolved settings
+# values, instead of LazySettings lookups and decoder construction per request
+_JWT = jwt.PyJWT()
+_SECRET = settings.JWT_SECRET_KEY
+_ALGS = [settings.JWT_ALGORITHM]
+
+
+@lru_cache(maxsize=4096)
+def _decode_cached(token):
+    """
+    Signature-verified decode, memoized per process.
+
+    The same token is typically presented for every call a client makes,
+    so repeat requests pay a dict hit instead of HMAC + base64. Failed
+    decodes raise and are never cached; expiry is re-checked by the caller
+    since a cached payload can outlive its token.
+    """
+    return _JWT.decode(token, _SECRET, algorithms=_ALGS)
+
 
 class JWTAuthentication(authentication.BaseAuthentication):
     """
@@ -32,12 +56,15 @@ class JWTAuthentication(authentication.BaseAuthentication):
             
             # Get the license from the payload
             license = self.get_license_from_payload(payload)
-            
+
+            # One timestamp for validation and usage tracking
+            now = timezone.now()
+
             # Validate the license
-            self.validate_license(license)
-            
+            self.validate_license(license, now)
+
             # Update token last used timestamp
-            self.update_token_usage(token, license)
+            self.update_token_usage(token, license, now)
             
             return (license, token)
             
@@ -80,11 +107,11 @@ class JWTAuthentication(authentication.BaseAuthentication):
         """
         Verify and decode the JWT token.
         """
-        return jwt.decode(
-            token,
-            settings.JWT_SECRET_KEY,
-            algorithms=[settings.JWT_ALGORITHM]
-        )
+        payload = _decode_cached(token)
+        # The cache only proves the signature once; expiry moves with time
+        if payload.get('exp', 0) <= time.time():
+            raise jwt.ExpiredSignatureError('Token has expired')
+        return payload
     
     def get_license_from_payload(self, payload):
         """
@@ -93,41 +120,42 @@ class JWTAuthentication(authentication.BaseAuthentication):
         tenant_id = payload.get('tenant_id')
         if not tenant_id:
             raise exceptions.AuthenticationFailed('Invalid token payload')
-        
-        return License.objects.get(tenant_id=tenant_id)
+
+        # Cache-first: hot tenants authenticate without touching Postgres
+        license = get_cached_license(tenant_id)
+        if license is None:
+            license = License.objects.only(*LICENSE_AUTH_FIELDS).get(tenant_id=tenant_id)
+            set_cached_license(license)
+        return license
     
-    def validate_license(self, license):
+    def validate_license(self, license, now=None):
         """
         Validate that the license is active and within validity period.
         """
-        now = timezone.now()
-        
+        if now is None:
+            now = timezone.now()
+        license_status, valid_from, valid_to = (
+            license.status, license.valid_from, license.valid_to
+        )
+
         # Check if license is active
-        if license.status != 'ACTIVE':
-            raise exceptions.AuthenticationFailed(f'License is {license.status.lower()}')
-        
+        if license_status != 'ACTIVE':
+            raise exceptions.AuthenticationFailed(f'License is {license_status.lower()}')
+
         # Check validity period
-        if now < license.valid_from:
+        if now < valid_from:
             raise exceptions.AuthenticationFailed('License not yet valid')
-        
-        if now > license.valid_to:
+
+        if now > valid_to:
             raise exceptions.AuthenticationFailed('License has expired')
     
-    def update_token_usage(self, token, license):
+    def update_token_usage(self, token, license, now=None):
         """
         Update the last used timestamp for the token.
         """
-        try:
-            token_obj = LicenseToken.objects.get(
-                token=token,
-                license=license,
-                is_active=True
-            )
-            token_obj.last_used_at = timezone.now()
-            token_obj.save(update_fields=['last_used_at'])
-        except LicenseToken.DoesNotExist:
-            # Token not tracked in database, which is okay for stateless JWT
-            pass
+        # Usage tracking is buffered and flushed in batches off the request
+        # path; untracked stateless JWTs simply match no row at flush time
+        record_token_usage(LicenseToken.hash_token(token), now)
     
     def authenticate_header(self, request):
         """
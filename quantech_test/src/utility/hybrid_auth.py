@@ -1,14 +1,65 @@
 from rest_framework import authentication, exceptions
+from django.core.cache import cache
 from django.utils import timezone
 from django.conf import settings
 from licenses.models import License, LicenseToken
 from user.models import UserProfileModel
 from authentication.jwt_utils import decode_jwt_token
+from utility.license_cache import get_cached_license, set_cached_license
+from utility.token_usage import record_token_usage
+import hashlib
+import time
 import jwt
 import logging
 
 logger = logging.getLogger(__name__)
 
+JWT_CACHE_PREFIX = 'auth:hybrid:'
+
+# Bound once at import: a reusable PyJWT instance and the resolved settings
+# values, instead of LazySettings lookups and decoder construction per request
+_JWT = jwt.PyJWT()
+_SECRET = settings.JWT_SECRET_KEY
+_ALGS = [settings.JWT_ALGORITHM]
+
+# Columns auth and downstream quota/ownership checks actually read; wide
+# fields (features, contacts, audit metadata) stay in the database
+LICENSE_AUTH_FIELDS = (
+    'id', 'tenant_id', 'tenant_name', 'status', 'valid_from', 'valid_to',
+    'max_apps', 'max_executions_per_24h'
+)
+
+
+def _decode_token_cached(token):
+    """
+    Decode and verify a JWT, caching the payload until the token expires.
+
+    A cache hit replaces signature verification with one hash + lookup;
+    failed validations are never cached.
+    """
+    cache_key = JWT_CACHE_PREFIX + hashlib.sha256(token.encode()).hexdigest()
+
+    payload = cache.get(cache_key)
+    if payload is not None:
+        # The cached payload was signature-verified; only expiry can go stale
+        if payload.get('exp', 0) <= time.time():
+            raise exceptions.AuthenticationFailed('Token has expired')
+        return payload
+
+    try:
+        payload = _JWT.decode(token, _SECRET, algorithms=_ALGS)
+    except jwt.ExpiredSignatureError:
+        raise exceptions.AuthenticationFailed('Token has expired')
+    except jwt.InvalidTokenError as e:
+        logger.error(f"Invalid token error: {e}")
+        raise exceptions.AuthenticationFailed('Invalid token')
+
+    ttl = payload.get('exp', 0) - time.time()
+    if ttl > 0:
+        cache.set(cache_key, payload, timeout=ttl)
+
+    return payload
+
 
 class HybridJWTAuthentication(authentication.BaseAuthentication):
     """
@@ -35,27 +86,23 @@ class HybridJWTAuthentication(authentication.BaseAuthentication):
             if not token:
                 return None
             
-            # Decode token to check its type
-            try:
-                payload = jwt.decode(
-                    token,
-                    settings.JWT_SECRET_KEY,
-                    algorithms=[settings.JWT_ALGORITHM]
-                )
-            except jwt.ExpiredSignatureError:
-                raise exceptions.AuthenticationFailed('Token has expired')
-            except jwt.InvalidTokenError as e:
-                logger.error(f"Invalid token error: {e}")
-                raise exceptions.AuthenticationFailed('Invalid token')
+            # Decode token to check its type (cached until the token expires)
+            payload = _decode_token_cached(token)
             
             # Check if it's a user token (has user_id)
             if 'user_id' in payload:
-                return self.authenticate_user(token, payload)
-            
+                user, token = self.authenticate_user(token, payload)
+                # Views read request.license instead of re-resolving the
+                # tenant with their own SELECT
+                request.license = self._resolve_user_license(user)
+                return (user, token)
+
             # Check if it's a license token (has tenant_id)
             elif 'tenant_id' in payload:
-                return self.authenticate_license(token, payload)
-            
+                license, token = self.authenticate_license(token, payload)
+                request.license = license
+                return (license, token)
+
             else:
                 raise exceptions.AuthenticationFailed('Token payload invalid: missing user_id or tenant_id')
                 
@@ -73,7 +120,10 @@ class HybridJWTAuthentication(authentication.BaseAuthentication):
             raise exceptions.AuthenticationFailed('Token payload invalid')
         
         try:
-            user = UserProfileModel.objects.get(id=user_id)
+            # Narrow projection: auth only needs identity + is_active
+            user = UserProfileModel.objects.only(
+                'id', 'username', 'email', 'is_active'
+            ).get(id=user_id)
         except UserProfileModel.DoesNotExist:
             raise exceptions.AuthenticationFailed('User not found')
         
@@ -82,6 +132,21 @@ class HybridJWTAuthentication(authentication.BaseAuthentication):
         
         return (user, token)
     
+    def _resolve_user_license(self, user):
+        """
+        Resolve the user's default license, None when absent.
+
+        Cache-first; never creates a license — that stays the job of the
+        view helpers that own the defaults.
+        """
+        tenant_id = f"user_{user.username}"
+        license = get_cached_license(tenant_id)
+        if license is None:
+            license = License.objects.only(*LICENSE_AUTH_FIELDS).filter(tenant_id=tenant_id).first()
+            if license is not None:
+                set_cached_license(license)
+        return license
+
     def authenticate_license(self, token, payload):
         """Authenticate using license token."""
         tenant_id = payload.get('tenant_id')
@@ -89,36 +154,34 @@ class HybridJWTAuthentication(authentication.BaseAuthentication):
         if not tenant_id:
             raise exceptions.AuthenticationFailed('Invalid token payload')
         
-        try:
-            license = License.objects.get(tenant_id=tenant_id)
-        except License.DoesNotExist:
-            raise exceptions.AuthenticationFailed('License not found')
-        
-        # Validate license
+        # Cache-first: hot tenants authenticate without touching Postgres
+        license = get_cached_license(tenant_id)
+        if license is None:
+            try:
+                license = License.objects.only(*LICENSE_AUTH_FIELDS).get(tenant_id=tenant_id)
+            except License.DoesNotExist:
+                raise exceptions.AuthenticationFailed('License not found')
+            set_cached_license(license)
+
+        # Validate license; one attribute read per field
         now = timezone.now()
-        
-        if license.status != 'ACTIVE':
-            raise exceptions.AuthenticationFailed(f'License is {license.status.lower()}')
-        
-        if now < license.valid_from:
+        license_status, valid_from, valid_to = (
+            license.status, license.valid_from, license.valid_to
+        )
+
+        if license_status != 'ACTIVE':
+            raise exceptions.AuthenticationFailed(f'License is {license_status.lower()}')
+
+        if now < valid_from:
             raise exceptions.AuthenticationFailed('License not yet valid')
-        
-        if now > license.valid_to:
+
+        if now > valid_to:
             raise exceptions.AuthenticationFailed('License has expired')
         
-        # Update token usage
-        try:
-            token_obj = LicenseToken.objects.get(
-                token=token,
-                license=license,
-                is_active=True
-            )
-            token_obj.last_used_at = timezone.now()
-            token_obj.save(update_fields=['last_used_at'])
-        except LicenseToken.DoesNotExist:
-            # Token not tracked in database, which is okay for stateless JWT
-            pass
-        
+        # Usage tracking is buffered and flushed in batches off the request
+        # path; untracked stateless JWTs simply match no row at flush time
+        record_token_usage(LicenseToken.hash_token(token), now)
+
         return (license, token)
     
     def authenticate_header(self, request):
@@ -0,0 +1,41 @@
+"""
+Cached license lookup by tenant_id.
+
+License rows change rarely, so a short-lived cache entry per tenant turns
+the per-request License SELECT into a cache hit. Entries are invalidated
+whenever a License is saved or deleted.
+"""
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from licenses.models import License
+
+LICENSE_CACHE_TIMEOUT = 300  # seconds
+
+
+def license_cache_key(tenant_id):
+    return f"lic:{tenant_id}"
+
+
+def get_cached_license(tenant_id):
+    """Return the cached License for this tenant, or None on a miss."""
+    return cache.get(license_cache_key(tenant_id))
+
+
+def set_cached_license(license):
+    cache.set(license_cache_key(license.tenant_id), license, LICENSE_CACHE_TIMEOUT)
+
+
+def invalidate_license_cache(tenant_id):
+    cache.delete(license_cache_key(tenant_id))
+
+
+@receiver(post_save, sender=License)
+def _invalidate_on_save(sender, instance, **kwargs):
+    invalidate_license_cache(instance.tenant_id)
+
+
+@receiver(post_delete, sender=License)
+def _invalidate_on_delete(sender, instance, **kwargs):
+    invalidate_license_cache(instance.tenant_id)
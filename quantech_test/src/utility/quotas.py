@@ -1,12 +1,29 @@
 from django.core.cache import cache
 from django.utils import timezone
-from datetime import timedelta
-import json
+from datetime import datetime, timedelta, timezone as dt_timezone
 import logging
-from typing import Tuple, List, Dict, Optional
+import threading
+from typing import Tuple, Dict, Iterator, Optional
 
 logger = logging.getLogger(__name__)
 
+# Trim-count-record in one server-side step: KEYS[1] window zset,
+# KEYS[2] hourly bucket; ARGV = min_timestamp, max_executions, timestamp,
+# member, ttl. Returns {allowed, count-after}. Scripts run atomically, so
+# no distributed lock is needed around the sequence.
+_QUOTA_CHECK_LUA = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+local c = redis.call('ZCARD', KEYS[1])
+if c >= tonumber(ARGV[2]) then
+    return {0, c}
+end
+redis.call('ZADD', KEYS[1], ARGV[3], ARGV[4])
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+redis.call('INCR', KEYS[2])
+redis.call('EXPIRE', KEYS[2], ARGV[5])
+return {1, c + 1}
+"""
+
 
 class QuotaService:
     """
@@ -15,43 +32,95 @@ class QuotaService:
 
     EXECUTION_TTL = 86400  # 24 hours in seconds
 
+    # Local fast path: skip the distributed lock while the per-process
+    # estimate is fresh and comfortably below the limit
+    LOCAL_ESTIMATE_TTL = 60  # seconds
+    LOCAL_FAST_PATH_HEADROOM = 0.8  # fraction of the limit
+
     def __init__(self):
         self.cache = cache
+        # Resolve key prefixing once instead of a hasattr probe per call
+        self._make_key = getattr(cache, 'make_key', None) or (lambda k: k)
+        # Per-process lower-bound estimates of each tenant's window count:
+        # {tenant_id: [count, refreshed_at]}. Best effort only — other
+        # processes' executions are invisible until the next refresh, which
+        # is why the fast path keeps a 20% headroom; Redis stays the ground
+        # truth near the limit.
+        self._local_counts = {}
+        self._local_counts_lock = threading.Lock()
         # Get raw Redis client for sorted set operations
         try:
             from django_redis import get_redis_connection
             self.redis = get_redis_connection("default")
+            self._check_and_record = self.redis.register_script(_QUOTA_CHECK_LUA)
         except Exception as e:
             logger.error(f"Failed to get Redis connection: {e}")
             self.redis = None
+            self._check_and_record = None
     
     def _get_execution_key(self, tenant_id: str) -> str:
         """Generate Redis key for execution tracking."""
-        base_key = f"executions:{tenant_id}"
-        # Use cache make_key to get the actual key with prefix
-        return self.cache.make_key(base_key) if hasattr(self.cache, 'make_key') else base_key
+        return self._make_key(f"executions:{tenant_id}")
 
     def _get_app_count_key(self, tenant_id: str) -> str:
         """Generate Redis key for app count."""
         return f"apps:count:{tenant_id}"
-    
-    def record_execution(self, tenant_id: str, job_id: str) -> bool:
+
+    def _get_bucket_key(self, tenant_id: str, bucket: int) -> str:
+        """Generate Redis key for one hourly execution-count bucket."""
+        return self._make_key(f"executions:bucket:{tenant_id}:{bucket}")
+
+    def _record_bucket(self, pipe, tenant_id: str, timestamp: float):
+        """Queue the hourly-bucket increment on an open pipeline."""
+        bucket_key = self._get_bucket_key(tenant_id, int(timestamp // 3600))
+        pipe.incr(bucket_key)
+        pipe.expire(bucket_key, self.EXECUTION_TTL + 3600)
+
+    def get_execution_count_approx(self, tenant_id: str, window_hours: int = 24) -> int:
         """
-        Record a new execution for the tenant.
-        Returns True if successful, False otherwise.
+        Approximate the sliding-window count from hourly buckets.
+
+        Sums the last `window_hours` hourly counters, weighting the oldest
+        bucket by how much of it still overlaps the window. O(1) Redis work
+        per check regardless of the execution limit, at the cost of up to one
+        hour of granularity at the window edge.
         """
         try:
-            key = self._get_execution_key(tenant_id)
-            timestamp = timezone.now().timestamp()
+            now = timezone.now().timestamp()
+            bucket = int(now // 3600)
+            keys = [self._get_bucket_key(tenant_id, b)
+                    for b in range(bucket - window_hours, bucket + 1)]
+            values = [int(v) if v else 0 for v in self.redis.mget(keys)]
+
+            # The oldest bucket only partially overlaps the window
+            elapsed_fraction = (now % 3600) / 3600
+            return int(values[0] * (1 - elapsed_fraction) + sum(values[1:]))
 
-            # Add execution to sorted set with timestamp as score
-            self.redis.zadd(key, {f"{job_id}:{timestamp}": timestamp})
+        except Exception as e:
+            logger.error(f"Error getting approximate execution count: {e}")
+            return 0
 
-            # Set expiration to ensure cleanup
-            self.redis.expire(key, self.EXECUTION_TTL + 3600)  # Extra hour for safety
 
-            # Clean up old executions
-            self._cleanup_old_executions(tenant_id)
+    def record_execution(self, tenant_id: str, job_id: str, now=None) -> bool:
+        """
+        Record a new execution for the tenant.
+        Returns True if successful, False otherwise.
+        """
+        try:
+            key = self._get_execution_key(tenant_id)
+            # Integer seconds: ample for a 24h window, cheaper to serialize
+            # than doubles, and unit-compatible with existing scores
+            timestamp = int((now or timezone.now()).timestamp())
+
+            # Add execution to sorted set with timestamp as score, bump the
+            # hourly counter bucket used by the approximate fast path, and
+            # trim expired entries — all in one network round-trip
+            with self.redis.pipeline(transaction=False) as pipe:
+                pipe.zadd(key, {job_id: timestamp})
+                pipe.expire(key, self.EXECUTION_TTL + 3600)  # Extra hour for safety
+                self._record_bucket(pipe, tenant_id, timestamp)
+                pipe.zremrangebyscore(key, '-inf', timestamp - self.EXECUTION_TTL)
+                pipe.execute()
 
             logger.info(f"Recorded execution for tenant {tenant_id}, job {job_id}")
             return True
@@ -60,17 +129,17 @@ class QuotaService:
             logger.error(f"Error recording execution: {e}")
             return False
     
-    def get_execution_count(self, tenant_id: str, window_hours: int = 24) -> int:
+    def get_execution_count(self, tenant_id: str, window_hours: int = 24, now=None) -> int:
         """
         Get the number of executions in the sliding window.
         """
         try:
             key = self._get_execution_key(tenant_id)
-            now = timezone.now().timestamp()
-            min_timestamp = now - (window_hours * 3600)
+            now_ts = int((now or timezone.now()).timestamp())
+            min_timestamp = now_ts - (window_hours * 3600)
 
             # Count executions within the window
-            count = self.redis.zcount(key, min_timestamp, now)
+            count = self.redis.zcount(key, min_timestamp, now_ts)
 
             logger.debug(f"Tenant {tenant_id} has {count} executions in last {window_hours} hours")
             return count or 0
@@ -84,7 +153,9 @@ class QuotaService:
         Check if tenant can execute another job.
         Returns (can_execute, current_count).
         """
-        current_count = self.get_execution_count(tenant_id)
+        # Approximate counter check: O(1) regardless of the limit. The
+        # atomic check-and-record path stays exact.
+        current_count = self.get_execution_count_approx(tenant_id)
         can_execute = current_count < max_executions
 
         if not can_execute:
@@ -92,7 +163,7 @@ class QuotaService:
 
         return can_execute, current_count
 
-    def check_and_record_execution_atomic(self, tenant_id: str, job_id: str, max_executions: int) -> Tuple[bool, int, Optional[str]]:
+    def check_and_record_execution_atomic(self, tenant_id: str, job_id: str, max_executions: int, now=None) -> Tuple[bool, int, Optional[str]]:
         """
         Atomically check quota and record execution if allowed.
         This prevents race conditions in concurrent requests.
@@ -100,52 +171,66 @@ class QuotaService:
         """
         try:
             key = self._get_execution_key(tenant_id)
-            lock_key = f"lock:{key}"
-            timestamp = timezone.now().timestamp()
-
-            # Use Redis lock to ensure atomicity
-            lock = self.cache.lock(lock_key, timeout=5)
-
-            if not lock.acquire(blocking=True, blocking_timeout=5):
-                logger.error(f"Failed to acquire lock for tenant {tenant_id}")
-                return False, 0, "System is busy, please try again"
-
-            try:
-                # Clean up old executions first
-                self._cleanup_old_executions(tenant_id)
-
-                # Get current count within the lock
-                current_count = self.get_execution_count(tenant_id)
-
-                # Check if we can execute
-                if current_count >= max_executions:
-                    logger.warning(f"Tenant {tenant_id} quota exceeded: {current_count}/{max_executions}")
-                    return False, current_count, f"Execution quota exceeded: {current_count}/{max_executions} executions in last 24h"
-
-                # Record the execution
-                self.redis.zadd(key, {f"{job_id}:{timestamp}": timestamp})
-                self.redis.expire(key, self.EXECUTION_TTL + 3600)
+            timestamp = int((now or timezone.now()).timestamp())
+
+            # Fast path: tenants far from their limit record straight into
+            # Redis without the distributed lock round-trips
+            with self._local_counts_lock:
+                entry = self._local_counts.get(tenant_id)
+                fast = (
+                    entry is not None
+                    and timestamp - entry[1] < self.LOCAL_ESTIMATE_TTL
+                    and entry[0] + 1 < max_executions * self.LOCAL_FAST_PATH_HEADROOM
+                )
+                if fast:
+                    entry[0] += 1
+                    estimated_count = entry[0]
+
+            if fast:
+                with self.redis.pipeline(transaction=False) as pipe:
+                    pipe.zadd(key, {job_id: timestamp})
+                    pipe.expire(key, self.EXECUTION_TTL + 3600)
+                    self._record_bucket(pipe, tenant_id, timestamp)
+                    pipe.execute()
+                return True, estimated_count, None
+
+            # Exact path: trim, count and conditionally record in a single
+            # atomic server-side script — one round-trip, no distributed
+            # lock, so contention can't surface as "System is busy"
+            bucket_key = self._get_bucket_key(tenant_id, int(timestamp // 3600))
+            allowed, current_count = self._check_and_record(
+                keys=[key, bucket_key],
+                args=[
+                    timestamp - self.EXECUTION_TTL,
+                    max_executions,
+                    timestamp,
+                    job_id,
+                    self.EXECUTION_TTL + 3600,
+                ],
+            )
 
-                new_count = current_count + 1
-                logger.info(f"Recorded execution for tenant {tenant_id}, job {job_id}. Count: {new_count}/{max_executions}")
+            # Refresh the local estimate from the exact count
+            with self._local_counts_lock:
+                self._local_counts[tenant_id] = [current_count, timestamp]
 
-                return True, new_count, None
+            if not allowed:
+                logger.warning(f"Tenant {tenant_id} quota exceeded: {current_count}/{max_executions}")
+                return False, current_count, f"Execution quota exceeded: {current_count}/{max_executions} executions in last 24h"
 
-            finally:
-                lock.release()
+            logger.info(f"Recorded execution for tenant {tenant_id}, job {job_id}. Count: {current_count}/{max_executions}")
+            return True, current_count, None
 
         except Exception as e:
             logger.error(f"Error in atomic check and record: {e}")
             return False, 0, f"Internal error: {str(e)}"
     
-    def _cleanup_old_executions(self, tenant_id: str):
+    def _cleanup_old_executions(self, tenant_id: str, now=None):
         """
         Remove executions older than 24 hours.
         """
         try:
             key = self._get_execution_key(tenant_id)
-            now = timezone.now().timestamp()
-            min_timestamp = now - self.EXECUTION_TTL
+            min_timestamp = int((now or timezone.now()).timestamp()) - self.EXECUTION_TTL
 
             # Remove old executions
             removed = self.redis.zremrangebyscore(key, '-inf', min_timestamp)
@@ -156,9 +241,12 @@ class QuotaService:
         except Exception as e:
             logger.error(f"Error cleaning up old executions: {e}")
     
-    def get_execution_history(self, tenant_id: str, hours: int = 24) -> List[Dict]:
+    def get_execution_history(self, tenant_id: str, hours: int = 24) -> Iterator[Dict]:
         """
-        Get execution history for the tenant.
+        Iterate execution history for the tenant, oldest first.
+
+        Yields one entry at a time so callers can stream large windows
+        instead of materializing the decoded history in memory.
         """
         try:
             key = self._get_execution_key(tenant_id)
@@ -169,23 +257,21 @@ class QuotaService:
             executions = self.redis.zrangebyscore(
                 key, min_timestamp, now, withscores=True
             )
-
-            history = []
-            for execution, timestamp in executions:
-                # Handle bytes from Redis
-                job_id_str = execution.decode('utf-8') if isinstance(execution, bytes) else execution
-                job_id = job_id_str.split(':')[0] if ':' in job_id_str else job_id_str
-                history.append({
-                    'job_id': job_id,
-                    'timestamp': timestamp,
-                    'datetime': timezone.datetime.fromtimestamp(timestamp, tz=timezone.utc)
-                })
-
-            return history
-
         except Exception as e:
             logger.error(f"Error getting execution history: {e}")
-            return []
+            return
+
+        for execution, timestamp in executions:
+            # Members are bare job ids (the score already carries the
+            # timestamp); the split only strips the legacy job:ts format
+            # and can go once pre-change entries age out of the window
+            job_id_str = execution.decode('utf-8') if isinstance(execution, bytes) else execution
+            job_id = job_id_str.split(':')[0] if ':' in job_id_str else job_id_str
+            yield {
+                'job_id': job_id,
+                'timestamp': timestamp,
+                'datetime': datetime.fromtimestamp(timestamp, tz=dt_timezone.utc)
+            }
     
     def update_app_count(self, tenant_id: str, count: int) -> bool:
         """
@@ -297,13 +383,61 @@ class QuotaService:
         except Exception as e:
             logger.error(f"Error resetting tenant data: {e}")
     
+    def get_quota_status_bulk(self, licenses) -> Dict[str, Dict]:
+        """
+        Quota status for many tenants in two batched cache trips.
+
+        One pipeline covers every tenant's window count and one get_many
+        covers the app counters, instead of two round-trips per tenant.
+        Returns {tenant_id: status_dict} in the get_quota_status shape.
+        """
+        now = timezone.now()
+        now_ts = now.timestamp()
+        min_ts = now_ts - self.EXECUTION_TTL
+
+        try:
+            with self.redis.pipeline(transaction=False) as pipe:
+                for license in licenses:
+                    pipe.zcount(self._get_execution_key(license.tenant_id), min_ts, now_ts)
+                execution_counts = pipe.execute()
+
+            app_keys = [self._get_app_count_key(l.tenant_id) for l in licenses]
+            app_counts = self.cache.get_many(app_keys)
+        except Exception as e:
+            logger.error(f"Error getting bulk quota status: {e}")
+            return {}
+
+        result = {}
+        for license, app_key, execution_count in zip(licenses, app_keys, execution_counts):
+            app_count = app_counts.get(app_key) or 0
+            max_executions = license.max_executions_per_24h
+            max_apps = license.max_apps
+            result[license.tenant_id] = {
+                'tenant_id': license.tenant_id,
+                'executions': {
+                    'current': execution_count,
+                    'max': max_executions,
+                    'remaining': max(0, max_executions - execution_count),
+                    'percentage_used': (execution_count / max_executions * 100) if max_executions > 0 else 0
+                },
+                'applications': {
+                    'current': app_count,
+                    'max': max_apps,
+                    'remaining': max(0, max_apps - app_count),
+                    'percentage_used': (app_count / max_apps * 100) if max_apps > 0 else 0
+                },
+                'timestamp': now
+            }
+        return result
+
     def get_quota_status(self, tenant_id: str, max_executions: int, max_apps: int) -> Dict:
         """
         Get comprehensive quota status for a tenant.
         """
-        execution_count = self.get_execution_count(tenant_id)
+        now = timezone.now()
+        execution_count = self.get_execution_count(tenant_id, now=now)
         app_count = self.get_app_count(tenant_id)
-        
+
         return {
             'tenant_id': tenant_id,
             'executions': {
@@ -318,7 +452,7 @@ class QuotaService:
                 'remaining': max(0, max_apps - app_count),
                 'percentage_used': (app_count / max_apps * 100) if max_apps > 0 else 0
             },
-            'timestamp': timezone.now()
+            'timestamp': now
         }
 
 
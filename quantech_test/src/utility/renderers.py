@@ -0,0 +1,21 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson.
+
+    DRF's default renderer encodes with the stdlib json module, which is the
+    dominant cost on large list responses. orjson encodes in C and natively
+    handles UUIDs and datetimes, so no custom encoder class is needed.
+    """
+
+    # Handles any remaining non-native types (e.g. lazy strings, Decimal)
+    # the same way DRF's JSONEncoder would
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=str, option=self._OPTIONS)
@@ -12,6 +12,10 @@ class ResponseWrapper:
         "message": <optional_message>,
         "status": <http_status_code>
     }
+
+    Each helper builds its body in a single dict literal and calls
+    Response once — no chained helper frames on the hot path. Rendering
+    itself goes through the project-wide orjson renderer.
     """
 
     @staticmethod
@@ -49,11 +53,11 @@ class ResponseWrapper:
         Returns:
             Response object with wrapped data
         """
-        return ResponseWrapper.success(
-            data=data,
-            message=message or 'Resource created successfully',
-            status_code=status.HTTP_201_CREATED
-        )
+        return Response({
+            'data': data,
+            'status': status.HTTP_201_CREATED,
+            'message': message or 'Resource created successfully',
+        }, status=status.HTTP_201_CREATED)
 
     @staticmethod
     def error(message, data=None, status_code=status.HTTP_400_BAD_REQUEST):
@@ -68,13 +72,11 @@ class ResponseWrapper:
         Returns:
             Response object with wrapped error
         """
-        response_data = {
+        return Response({
             'data': data,
             'message': message,
             'status': status_code
-        }
-
-        return Response(response_data, status=status_code)
+        }, status=status_code)
 
     @staticmethod
     def not_found(message="Resource not found", data=None):
@@ -88,11 +90,11 @@ class ResponseWrapper:
         Returns:
             Response object with wrapped error
         """
-        return ResponseWrapper.error(
-            message=message,
-            data=data,
-            status_code=status.HTTP_404_NOT_FOUND
-        )
+        return Response({
+            'data': data,
+            'message': message,
+            'status': status.HTTP_404_NOT_FOUND
+        }, status=status.HTTP_404_NOT_FOUND)
 
     @staticmethod
     def forbidden(message="Forbidden", data=None):
@@ -106,11 +108,11 @@ class ResponseWrapper:
         Returns:
             Response object with wrapped error
         """
-        return ResponseWrapper.error(
-            message=message,
-            data=data,
-            status_code=status.HTTP_403_FORBIDDEN
-        )
+        return Response({
+            'data': data,
+            'message': message,
+            'status': status.HTTP_403_FORBIDDEN
+        }, status=status.HTTP_403_FORBIDDEN)
 
     @staticmethod
     def unauthorized(message="Unauthorized", data=None):
@@ -124,11 +126,11 @@ class ResponseWrapper:
         Returns:
             Response object with wrapped error
         """
-        return ResponseWrapper.error(
-            message=message,
-            data=data,
-            status_code=status.HTTP_401_UNAUTHORIZED
-        )
+        return Response({
+            'data': data,
+            'message': message,
+            'status': status.HTTP_401_UNAUTHORIZED
+        }, status=status.HTTP_401_UNAUTHORIZED)
 
     @staticmethod
     def too_many_requests(message="Too many requests", data=None):
@@ -142,8 +144,8 @@ class ResponseWrapper:
         Returns:
             Response object with wrapped error
         """
-        return ResponseWrapper.error(
-            message=message,
-            data=data,
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS
-        )
+        return Response({
+            'data': data,
+            'message': message,
+            'status': status.HTTP_429_TOO_MANY_REQUESTS
+        }, status=status.HTTP_429_TOO_MANY_REQUESTS)
@@ -0,0 +1,24 @@
+from copy import copy
+
+
+class CachedFieldsMixin:
+    """
+    Cache the field set generated by ModelSerializer.get_fields per serializer
+    class.
+
+    DRF rebuilds the whole field map on every serializer instantiation, which
+    is a dominant cost on list endpoints. Fields are built once per class and
+    shallow-copied for each instance, which is safe as long as the serializer
+    has no nested serializer fields (method/char fields only hold per-field
+    configuration, not per-instance state).
+    """
+
+    _fields_cache = None
+
+    def get_fields(self):
+        cls = self.__class__
+        fields = cls.__dict__.get('_fields_cache')
+        if fields is None:
+            fields = super().get_fields()
+            cls._fields_cache = fields
+        return {name: copy(field) for name, field in fields.items()}
@@ -0,0 +1,65 @@
+import logging
+import threading
+import time
+
+from django.db import close_old_connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 5.0
+
+_pending = {}
+_pending_lock = threading.Lock()
+_flusher = None
+
+
+def record_token_usage(token_hash, now=None):
+    """
+    Buffer a last_used_at touch for the token; no database work here.
+
+    Authentication calls this on every request, so the write is deferred
+    to a background flush that folds all touches from the interval into
+    one UPDATE. The timestamp is approximate to within FLUSH_INTERVAL,
+    which is plenty for a usage-tracking column. Callers that already
+    hold a timestamp pass it in rather than building another datetime.
+    """
+    global _flusher
+    with _pending_lock:
+        _pending[token_hash] = now or timezone.now()
+        if _flusher is None:
+            _flusher = threading.Thread(
+                target=_flush_loop, name='token-usage-flusher', daemon=True
+            )
+            _flusher.start()
+
+
+def flush_pending():
+    """Write out all buffered touches with a single set-based UPDATE."""
+    with _pending_lock:
+        if not _pending:
+            return 0
+        batch = dict(_pending)
+        _pending.clear()
+
+    from licenses.models import LicenseToken
+
+    # One statement for the whole interval; per-token timestamps are
+    # collapsed to the newest, an acceptable loss for a last-seen column
+    return LicenseToken.objects.filter(
+        token_hash__in=list(batch),
+        is_active=True
+    ).update(last_used_at=max(batch.values()))
+
+
+def _flush_loop():
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        try:
+            # This thread never crosses a request boundary, so stale/broken
+            # connections must be recycled here or a dropped connection
+            # would fail every flush until the worker restarts
+            close_old_connections()
+            flush_pending()
+        except Exception as e:
+            logger.error(f"Token usage flush failed: {e}")